@@ -2,6 +2,7 @@
 Refactored Telegram bot handler using modular architecture
 """
 
+import asyncio
 import contextlib
 import logging
 import time
@@ -14,6 +15,7 @@ from telegram.ext import (
     CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
+    Defaults,
     MessageHandler,
     filters,
 )
@@ -22,6 +24,7 @@ from .config import get_settings
 from .core.database.database_manager import get_db_manager
 from .core.handlers.command_handlers import CommandHandlers
 from .core.handlers.message_handlers import MessageHandlers
+from .core.locks.telegram_rate_limiter import TelegramRateLimiter
 from .core.locks.user_lock_manager import UserLockManager
 from .core.scheduler.reminder_scheduler import ReminderScheduler
 from .core.session.session_manager import SessionManager
@@ -136,16 +139,7 @@ class BotHandler:
             logger.info("Reminder scheduler is disabled in configuration")
 
         try:
-            # Create application
-            self.application = (
-                Application.builder()
-                .token(self.settings.telegram_bot_token)
-                .read_timeout(30)
-                .write_timeout(30)
-                .connect_timeout(30)
-                .pool_timeout(30)
-                .build()
-            )
+            self.application = self._build_application()
 
             # Add handlers
             self._add_handlers()
@@ -168,8 +162,6 @@ class BotHandler:
             )
 
             # Keep the application running until interrupted
-            import asyncio
-
             try:
                 while True:
                     await asyncio.sleep(1)
@@ -197,6 +189,26 @@ class BotHandler:
                 except Exception as e:
                     logger.error(f"Error stopping application: {e}")
 
+    def _build_application(self) -> Application:
+        """Create the PTB application with this bot's network settings"""
+        return (
+            Application.builder()
+            .token(self.settings.telegram_bot_token)
+            .read_timeout(30)
+            .write_timeout(30)
+            .connect_timeout(30)
+            .pool_timeout(30)
+            # Run every handler as its own task: a slow Telegram round trip
+            # or a long text for one chat no longer queues the others.
+            # lock_manager guards text processing per user, and stale
+            # rating presses are dropped by SessionManager
+            .defaults(Defaults(block=False))
+            # Spread bursts (reminders, many users finishing at once) under
+            # Telegram's flood limits instead of collecting 429s
+            .rate_limiter(TelegramRateLimiter())
+            .build()
+        )
+
     def _add_handlers(self):
         """Add command and message handlers"""
         app = self.application
@@ -649,7 +661,9 @@ class BotHandler:
 
         try:
             # Get user from database
-            db_user = self.db_manager.get_user_by_telegram_id(user.id)
+            db_user = await asyncio.to_thread(
+                self.db_manager.get_user_by_telegram_id, user.id
+            )
             if not db_user:
                 await self._safe_reply(
                     update,
@@ -676,7 +690,11 @@ class BotHandler:
             timer.start()
 
             # Extract words
-            extracted_words = self.text_parser.extract_words(text, max_length=50)
+            # spaCy parsing and the database calls below run in worker
+            # threads so a long text never stalls the event loop
+            extracted_words = await asyncio.to_thread(
+                self.text_parser.extract_words, text, max_length=50
+            )
 
             if not extracted_words:
                 processing_msg = (
@@ -696,8 +714,10 @@ class BotHandler:
                 extracted_words = extracted_words[:max_words]
 
             # Check which words already exist
-            word_existence = self.db_manager.check_multiple_words_exist(
-                db_user["telegram_id"], extracted_words
+            word_existence = await asyncio.to_thread(
+                self.db_manager.check_multiple_words_exist,
+                db_user["telegram_id"],
+                extracted_words,
             )
 
             existing_words = [word for word, exists in word_existence.items() if exists]
@@ -741,8 +761,10 @@ class BotHandler:
                         )
 
                     # Add to database
-                    add_result = self.db_manager.add_words_with_details(
-                        db_user["telegram_id"], words_data
+                    add_result = await asyncio.to_thread(
+                        self.db_manager.add_words_with_details,
+                        db_user["telegram_id"],
+                        words_data,
                     )
                     added_count = len(add_result["added"])
 
@@ -771,10 +793,10 @@ class BotHandler:
                     # Get details for existing words if any
                     existing_words_details = []
                     if already_known:
-                        existing_words_details = (
-                            self.db_manager.get_existing_words_details(
-                                db_user["telegram_id"], already_known
-                            )
+                        existing_words_details = await asyncio.to_thread(
+                            self.db_manager.get_existing_words_details,
+                            db_user["telegram_id"],
+                            already_known,
                         )
 
                     # Words lost to lemma merges or bad translations, so the
@@ -844,8 +866,10 @@ class BotHandler:
                     )
             else:
                 # Get details for all existing words
-                existing_words_details = self.db_manager.get_existing_words_details(
-                    db_user["telegram_id"], existing_words
+                existing_words_details = await asyncio.to_thread(
+                    self.db_manager.get_existing_words_details,
+                    db_user["telegram_id"],
+                    existing_words,
                 )
 
                 # Build message showing all existing words
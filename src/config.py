@@ -28,6 +28,8 @@ class Settings(BaseSettings):
     database_url: str = Field(default="sqlite:///data/bot.db", env="DATABASE_URL")
     database_backup_enabled: bool = Field(default=True, env="DATABASE_BACKUP_ENABLED")
     database_backup_interval: int = Field(default=24, env="DATABASE_BACKUP_INTERVAL")
+    # Development aid: log full table scans in the plan of each new statement
+    sqlite_explain: bool = Field(default=False, env="SQLITE_EXPLAIN")
 
     # Application Configuration
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
@@ -0,0 +1,56 @@
+"""
+Small in-process cache for hot single-row reads
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class RowCache:
+    """LRU cache of row dicts with a short time-to-live.
+
+    Repositories invalidate entries on their own writes; the TTL bounds how
+    long a write from another process (the backfill scripts, say) can go
+    unseen. Rows are copied on the way in and out so callers that add keys to
+    a returned dict never touch the cached one.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 5.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._rows: OrderedDict[Hashable, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """Return a copy of the cached row, or None if missing or expired"""
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is None:
+                return None
+            expires_at, row = entry
+            if expires_at <= time.monotonic():
+                del self._rows[key]
+                return None
+            self._rows.move_to_end(key)
+            return dict(row)
+
+    def set(self, key: Hashable, row: dict[str, Any]) -> None:
+        """Cache a copy of row under key, evicting the least recently used"""
+        with self._lock:
+            self._rows[key] = (time.monotonic() + self.ttl, dict(row))
+            self._rows.move_to_end(key)
+            if len(self._rows) > self.maxsize:
+                self._rows.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop key if cached"""
+        with self._lock:
+            self._rows.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached row"""
+        with self._lock:
+            self._rows.clear()
@@ -2,16 +2,78 @@
 Database connection manager for the German Learning Bot
 """
 
+import atexit
 import logging
 import sqlite3
+import threading
+import weakref
 from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
 
-from ...config import get_database_path
+from ...config import get_database_path, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Per-connection cache of compiled statements, well above the 128 default so
+# every query in the three repositories stays compiled on a reused connection
+_CACHED_STATEMENTS = 512
+
+# Every live DatabaseConnection, so their cached connections are closed
+# cleanly at interpreter exit
+_instances: "weakref.WeakSet[DatabaseConnection]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all_connections() -> None:
+    for instance in list(_instances):
+        instance.close()
+
+
+# Statement kinds worth a plan check; PRAGMA, DDL and transaction control
+# have no query plan to speak of
+_PLANNED_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+_plans_seen: set[str] = set()
+_plans_seen_lock = threading.Lock()
+
+
+class _PlanCheckingConnection(sqlite3.Connection):
+    """Connection that logs full table scans in each new statement's plan.
+
+    A development aid behind SQLITE_EXPLAIN: the first time a statement text
+    is executed its EXPLAIN QUERY PLAN is run with the same parameters, and
+    every SCAN step other than over json_each or a constant row is logged.
+    """
+
+    def execute(self, sql, parameters=(), /):
+        self._check_plan(sql, parameters)
+        return super().execute(sql, parameters)
+
+    def _check_plan(self, sql: str, parameters) -> None:
+        words = sql.split(None, 1)
+        if not words or words[0].upper() not in _PLANNED_STATEMENTS:
+            return
+        with _plans_seen_lock:
+            if sql in _plans_seen:
+                return
+            _plans_seen.add(sql)
+
+        try:
+            # sql is the statement about to run, not a value: EXPLAIN only
+            # compiles it, with the caller's parameters still bound
+            steps = super().execute("EXPLAIN QUERY PLAN " + sql, parameters)
+            details = [step[3] for step in steps]
+        except sqlite3.Error as e:
+            logger.debug(f"Could not explain statement: {e}")
+            return
+
+        for detail in details:
+            if detail.startswith("SCAN ") and not (
+                "VIRTUAL TABLE" in detail or "CONSTANT ROW" in detail
+            ):
+                logger.warning(f"Query plan scans: {detail}\n{sql.strip()}")
+
+
 # Fragments of the words-table migration, kept apart because a legacy table
 # may lack the trailing columns. Assembled from these constants only.
 _MIGRATE_WORDS_HEAD = """
@@ -42,8 +104,19 @@ _MIGRATE_WORDS_TAIL = "\n    FROM words\n"
 class DatabaseConnection:
     """Manages SQLite database connections and settings"""
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | None = None, explain_plans: bool | None = None):
+        # The SQLITE_EXPLAIN setting applies to the configured database; an
+        # explicit path (tests, scripts) opts in through explain_plans
+        if explain_plans is None:
+            explain_plans = db_path is None and get_settings().sqlite_explain
+        self.explain_plans = explain_plans
         self.db_path = db_path or get_database_path()
+        # One connection per thread, opened on first use and kept for the
+        # life of this object; _connections lets close() reach all of them
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        _instances.add(self)
         self._ensure_database_directory()
         self._init_connection_settings()
 
@@ -53,79 +126,162 @@ class DatabaseConnection:
         db_dir.mkdir(parents=True, exist_ok=True)
 
     def _init_connection_settings(self) -> None:
-        """Initialize database connection settings"""
+        """Open the first connection and check the journal mode took"""
         with self.get_connection() as conn:
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
-            # Enable foreign key constraints
-            conn.execute("PRAGMA foreign_keys=ON")
-            # Set timeout for busy database
-            conn.execute("PRAGMA busy_timeout=30000")
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            # In-memory databases cannot use WAL and report "memory"
+            if journal_mode != "wal" and ":memory:" not in str(self.db_path):
+                logger.warning(
+                    f"Database is in {journal_mode} journal mode, not WAL; "
+                    "readers will block writers"
+                )
+
+    def _configure(self, conn: sqlite3.Connection) -> None:
+        """Apply the settings sqlite keeps per connection, not per file"""
+        # Enable WAL mode for better concurrency
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Enable foreign key constraints
+        conn.execute("PRAGMA foreign_keys=ON")
+        # Set timeout for busy database
+        conn.execute("PRAGMA busy_timeout=30000")
+        # WAL only needs fsync at checkpoints; page cache, temp tables and
+        # mmap sized for a single-file bot database
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+
+    def _open_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection and apply the per-connection settings once"""
+        # Shared across threads only by close(); each thread otherwise
+        # sticks to its own connection
+        factory = _PlanCheckingConnection if self.explain_plans else sqlite3.Connection
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=_CACHED_STATEMENTS,
+            check_same_thread=False,
+            factory=factory,
+        )
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+
+        self._configure(conn)
+        if read_only:
+            # Set after _configure: switching to WAL is itself a write
+            conn.execute("PRAGMA query_only=1")
+
+        # Add custom date and timestamp adapters to avoid deprecation warnings
+        def adapt_date(val):
+            return val.isoformat()
+
+        def adapt_datetime(val):
+            return val.isoformat()
+
+        def convert_date(val):
+            try:
+                return date.fromisoformat(val.decode())
+            except ValueError:
+                # Try alternative formats
+                date_str = val.decode()
+                for fmt in ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]:
+                    try:
+                        return datetime.strptime(date_str, fmt).date()
+                    except ValueError:
+                        continue
+                raise ValueError(f"Invalid date format: {date_str}") from None
+
+        def convert_datetime(val):
+            try:
+                return datetime.fromisoformat(val.decode())
+            except ValueError:
+                # Try alternative formats
+                datetime_str = val.decode()
+                for fmt in [
+                    "%Y-%m-%d %H:%M:%S",
+                    "%Y-%m-%d %H:%M:%S.%f",
+                    "%Y-%m-%d",
+                ]:
+                    try:
+                        return datetime.strptime(datetime_str, fmt)
+                    except ValueError:
+                        continue
+                raise ValueError(f"Invalid datetime format: {datetime_str}") from None
+
+        sqlite3.register_adapter(date, adapt_date)
+        sqlite3.register_adapter(datetime, adapt_datetime)
+        sqlite3.register_converter("date", convert_date)
+        sqlite3.register_converter("datetime", convert_datetime)
+        sqlite3.register_converter(
+            "timestamp", convert_datetime
+        )  # Handle TIMESTAMP type
+
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
 
     @contextmanager
     def get_connection(self):
-        """Get database connection with proper cleanup"""
-        conn = None
+        """Get this thread's read-write connection with proper cleanup.
+
+        Nested uses share the connection; only the outermost one rolls back
+        whatever was left uncommitted, as closing a fresh connection used to.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.depth = 0
+
+        self._local.depth += 1
         try:
-            conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
-
-            # Add custom date and timestamp adapters to avoid deprecation warnings
-            def adapt_date(val):
-                return val.isoformat()
-
-            def adapt_datetime(val):
-                return val.isoformat()
-
-            def convert_date(val):
-                try:
-                    return date.fromisoformat(val.decode())
-                except ValueError:
-                    # Try alternative formats
-                    date_str = val.decode()
-                    for fmt in ["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"]:
-                        try:
-                            return datetime.strptime(date_str, fmt).date()
-                        except ValueError:
-                            continue
-                    raise ValueError(f"Invalid date format: {date_str}") from None
-
-            def convert_datetime(val):
-                try:
-                    return datetime.fromisoformat(val.decode())
-                except ValueError:
-                    # Try alternative formats
-                    datetime_str = val.decode()
-                    for fmt in [
-                        "%Y-%m-%d %H:%M:%S",
-                        "%Y-%m-%d %H:%M:%S.%f",
-                        "%Y-%m-%d",
-                    ]:
-                        try:
-                            return datetime.strptime(datetime_str, fmt)
-                        except ValueError:
-                            continue
-                    raise ValueError(
-                        f"Invalid datetime format: {datetime_str}"
-                    ) from None
-
-            sqlite3.register_adapter(date, adapt_date)
-            sqlite3.register_adapter(datetime, adapt_datetime)
-            sqlite3.register_converter("date", convert_date)
-            sqlite3.register_converter("datetime", convert_datetime)
-            sqlite3.register_converter(
-                "timestamp", convert_datetime
-            )  # Handle TIMESTAMP type
-
             yield conn
         except Exception as e:
-            if conn:
+            if self._local.depth == 1:
                 conn.rollback()
             logger.error(f"Database error: {e}")
             raise
         finally:
-            if conn:
+            self._local.depth -= 1
+            if self._local.depth == 0 and conn.in_transaction:
+                conn.rollback()
+
+    @contextmanager
+    def get_reader(self):
+        """Get this thread's read-only connection.
+
+        Under WAL readers never wait on the writer, so plain lookups get a
+        connection of their own with query_only set. A read inside an open
+        get_connection() block stays on that connection to see its own
+        uncommitted writes, and an in-memory database, which a second
+        connection could not see, always uses the writer.
+        """
+        if getattr(self._local, "depth", 0) or ":memory:" in str(self.db_path):
+            with self.get_connection() as conn:
+                yield conn
+            return
+
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = self._open_connection(read_only=True)
+            self._local.reader = conn
+
+        try:
+            yield conn
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            raise
+
+    def close(self) -> None:
+        """Close every connection this object has opened, in any thread"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
                 conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+        # Threads that come back after close() open a fresh connection
+        self._local = threading.local()
 
     def init_database(self) -> None:
         """Initialize database tables"""
@@ -253,6 +409,9 @@ class DatabaseConnection:
 
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_words_lemma ON words(lemma)",
+            # Every existence check matches LOWER(lemma); without an index on
+            # the expression each one scans the whole words table
+            "CREATE INDEX IF NOT EXISTS idx_words_lemma_lower ON words(LOWER(lemma))",
             (
                 f"CREATE INDEX IF NOT EXISTS idx_learning_progress_{user_id_column} "
                 f"ON learning_progress({user_id_column})"
@@ -275,6 +434,34 @@ class DatabaseConnection:
             ),
         ]
 
+        # Per-user range scans: review windows for stats and due-date lookups.
+        # (telegram_id, word_id) is already covered by the UNIQUE constraint.
+        if review_user_id_column == "telegram_id":
+            indexes.append(
+                "CREATE INDEX IF NOT EXISTS idx_review_history_user_reviewed_at "
+                "ON review_history(telegram_id, reviewed_at)"
+            )
+        if user_id_column == "telegram_id":
+            indexes.append(
+                "CREATE INDEX IF NOT EXISTS idx_learning_progress_user_next_review "
+                "ON learning_progress(telegram_id, next_review_date)"
+            )
+            # Partial indexes holding only the rows the new/difficult study
+            # picks match, so their candidate-id reads never touch the table.
+            # SQLite only treats an index as covering when it carries every
+            # filtered column, hence the trailing ones
+            indexes.append(
+                "CREATE INDEX IF NOT EXISTS idx_learning_progress_new "
+                "ON learning_progress(telegram_id, word_id, repetitions) "
+                "WHERE repetitions = 0"
+            )
+            indexes.append(
+                "CREATE INDEX IF NOT EXISTS idx_learning_progress_difficult "
+                "ON learning_progress"
+                "(telegram_id, word_id, easiness_factor, repetitions) "
+                "WHERE easiness_factor < 2.0 AND repetitions > 0"
+            )
+
         for index_sql in indexes:
             try:
                 conn.execute(index_sql)
@@ -282,6 +469,10 @@ class DatabaseConnection:
                 logger.warning(f"Failed to create index: {index_sql}, error: {e}")
                 # Continue with other indexes
 
+        # Refresh planner statistics so the new indexes are actually chosen
+        conn.execute("ANALYZE")
+        conn.commit()
+
     def _run_migrations(self, conn: sqlite3.Connection) -> None:
         """Run database migrations for schema updates"""
         try:
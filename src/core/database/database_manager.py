@@ -3,16 +3,29 @@ Unified database manager that coordinates all repositories
 """
 
 import logging
+import threading
+from collections.abc import Iterator
 from typing import Any
 
 from .connection import DatabaseConnection
 from .models import User, UserStats, Word
 from .repositories.progress_repository import ProgressRepository
 from .repositories.user_repository import UserRepository
-from .repositories.word_repository import WordRepository
+from .repositories.word_repository import WordRepository, sqlite_lower
 
 logger = logging.getLogger(__name__)
 
+# Verb endings _get_potential_lemmas strips, keyed by the word's tail:
+# ending -> (characters to cut, suffix to add). Longer tails are tried first,
+# so "bedeutest" resolves via "est" rather than "st".
+_SUFFIX_RULES_3 = {"est": (3, "en")}
+_SUFFIX_RULES_2 = {"en": (2, ""), "et": (2, "en"), "st": (2, "en")}
+_SUFFIX_RULES_1 = {"t": (1, "en"), "e": (1, "en")}
+
+# Lemma count from which check_multiple_words_exist loads the user's whole
+# vocabulary instead of probing each form
+_BULK_EXISTENCE_THRESHOLD = 4
+
 
 class DatabaseManager:
     """Unified database manager that coordinates all repositories"""
@@ -67,6 +80,19 @@ class DatabaseManager:
         self, telegram_id: int, lemmas: list[str]
     ) -> dict[str, bool]:
         """Check existence of multiple words at once, including potential lemma forms"""
+        # Past a handful of words, one fetch of the user's whole vocabulary
+        # beats a query per candidate form. Forms are folded as the point
+        # lookups' LOWER() folds them, so batch size never changes the answer
+        if len(lemmas) >= _BULK_EXISTENCE_THRESHOLD:
+            known = self.word_repo.get_all_user_lemmas(telegram_id)
+            return {
+                lemma: any(
+                    sqlite_lower(form) in known
+                    for form in self._get_potential_lemmas(lemma)
+                )
+                for lemma in lemmas
+            }
+
         result = {}
 
         for lemma in lemmas:
@@ -91,6 +117,12 @@ class DatabaseManager:
         """Get all words for a user with learning progress"""
         return self.word_repo.get_words_by_user(telegram_id)
 
+    def iter_words_by_user(
+        self, telegram_id: int, page_size: int = 200
+    ) -> Iterator[dict[str, Any]]:
+        """Yield a user's words newest first, one page of rows at a time"""
+        return self.word_repo.iter_words_by_user(telegram_id, page_size)
+
     def get_due_words(
         self, telegram_id: int, limit: int = 10, randomize: bool = True
     ) -> list[dict[str, Any]]:
@@ -285,13 +317,8 @@ class DatabaseManager:
         self, telegram_id: int, word_data: dict[str, Any]
     ) -> Word | None:
         """Add a single word to user's learning progress"""
-        added_count = self.word_repo.add_words_to_user(telegram_id, [word_data])
-        if added_count > 0:
-            # Return the word that was added
-            lemma = word_data.get("lemma")
-            if lemma:
-                return self.word_repo.get_word_by_lemma(lemma)
-        return None
+        rows = self.word_repo.add_words_returning_rows(telegram_id, [word_data])
+        return rows[0] if rows else None
 
     # Progress methods
     def update_learning_progress(
@@ -302,6 +329,12 @@ class DatabaseManager:
             telegram_id, word_id, rating, response_time_ms=response_time_ms
         )
 
+    def bulk_add_reviews(
+        self, telegram_id: int, reviews: list[tuple[int, int, int]]
+    ) -> bool:
+        """Apply (word_id, rating, response_time_ms) reviews in one transaction"""
+        return self.progress_repo.bulk_update_learning_progress(telegram_id, reviews)
+
     def get_learning_progress(
         self, telegram_id: int, word_id: int
     ) -> dict[str, Any] | None:
@@ -314,6 +347,12 @@ class DatabaseManager:
         """Get review history for user or specific word"""
         return self.progress_repo.get_review_history(telegram_id, word_id, limit)
 
+    def iter_review_history(
+        self, telegram_id: int, word_id: int | None = None, limit: int = 100
+    ) -> Iterator[dict[str, Any]]:
+        """Yield review history newest first without building a list"""
+        return self.progress_repo.iter_review_history(telegram_id, word_id, limit)
+
     def get_performance_stats(self, telegram_id: int, days: int = 30) -> dict[str, Any]:
         """Get performance statistics for user"""
         return self.progress_repo.get_performance_stats(telegram_id, days)
@@ -334,17 +373,28 @@ class DatabaseManager:
     def add_words_batch(
         self, telegram_id: int, words_data: list[dict[str, Any]]
     ) -> list[int]:
-        """Add multiple words and return list of word IDs"""
-        count = self.add_words_to_user(telegram_id, words_data)
-        # Return mock list of IDs for now - this could be improved
-        return list(range(1, count + 1))
+        """Add multiple words and return the IDs of the words actually added"""
+        rows = self.word_repo.add_words_returning_rows(telegram_id, words_data)
+        return [row["id"] for row in rows]
 
     def get_existing_words_from_list(
         self, telegram_id: int, lemmas: list[str]
     ) -> list[str]:
         """Get existing words from a list of lemmas"""
-        existence_map = self.check_multiple_words_exist(telegram_id, lemmas)
-        return [lemma for lemma, exists in existence_map.items() if exists]
+        # One query over every candidate form; a lemma counts as existing
+        # when any of its forms does, same as check_multiple_words_exist
+        forms = {lemma: self._get_potential_lemmas(lemma) for lemma in lemmas}
+        found = {
+            sqlite_lower(form)
+            for form in self.word_repo.filter_existing_lemmas(
+                telegram_id, [form for group in forms.values() for form in group]
+            )
+        }
+        return [
+            lemma
+            for lemma, group in forms.items()
+            if any(sqlite_lower(form) in found for form in group)
+        ]
 
     def get_existing_words_details(
         self, telegram_id: int, lemmas: list[str]
@@ -368,38 +418,45 @@ class DatabaseManager:
         """Get database connection for direct SQL access in tests"""
         return self.db_connection.get_connection()
 
-    def _get_potential_lemmas(self, word: str) -> list[str]:
+    def _get_potential_lemmas(self, word: str) -> tuple[str, ...]:
         """Get potential lemmas for a word - helper method for tests"""
-        # Basic implementation for German verb inflection detection
-        potential_lemmas = [word]
-
-        # Remove common German endings and try to construct base form
-        if word.endswith("en"):
-            potential_lemmas.append(word[:-2])
-        elif word.endswith("est"):
-            # For words ending in 'est' (like bedeutest), remove 'est' and add 'en'
-            potential_lemmas.append(word[:-3] + "en")
-        elif word.endswith("et"):
-            # For words ending in 'et' (like bedeutet), remove 'et' and add 'en'
-            potential_lemmas.append(word[:-2] + "en")
-        elif word.endswith("st"):
-            potential_lemmas.append(word[:-2] + "en")
-        elif word.endswith("t"):
-            # For words ending in 't', try removing 't' and adding 'en'
-            potential_lemmas.append(word[:-1] + "en")
-        elif word.endswith("e"):
-            potential_lemmas.append(word[:-1] + "en")
-
-        return list(set(potential_lemmas))
+        # Short words have no other base form worth trying
+        if len(word) <= 3:
+            return (word,)
+
+        # Basic implementation for German verb inflection detection:
+        # remove a common German ending and construct the infinitive
+        rule = (
+            _SUFFIX_RULES_3.get(word[-3:])
+            or _SUFFIX_RULES_2.get(word[-2:])
+            or _SUFFIX_RULES_1.get(word[-1])
+        )
+        if rule is None:
+            return (word,)
+
+        cut, suffix = rule
+        candidate = word[:-cut] + suffix
+
+        # The word itself always comes first, so callers check it before the
+        # guessed base form
+        return (word,) if candidate == word else (word, candidate)
 
 
 # Global instance
 _db_manager = None
+_db_manager_lock = threading.Lock()
 
 
 def get_db_manager(db_path: str | None = None) -> DatabaseManager:
     """Get global database manager instance"""
     global _db_manager
-    if _db_manager is None:
-        _db_manager = DatabaseManager(db_path)
+    # Unlocked fast path: once built, the instance never changes
+    if _db_manager is not None:
+        return _db_manager
+
+    # Two threads can both see None above; only the first one to take the
+    # lock builds the manager, the other finds it already there
+    with _db_manager_lock:
+        if _db_manager is None:
+            _db_manager = DatabaseManager(db_path)
     return _db_manager
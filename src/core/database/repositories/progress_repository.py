@@ -2,21 +2,88 @@
 Progress repository for learning progress and review history operations
 """
 
+import json
 import logging
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import datetime, timedelta
 from typing import Any
 
+from ....spaced_repetition import get_srs_system
+from ..cache import RowCache
 from ..connection import DatabaseConnection
 from ..models import LearningProgress, ReviewHistory
 
 logger = logging.getLogger(__name__)
 
+# Read paths hit on every card and every /stats call. Kept as constants so the
+# text handed to sqlite is identical on each call and the connection's
+# statement cache serves the compiled program instead of re-preparing it.
+SQL_REVIEW_STATE = """
+    SELECT repetitions, easiness_factor, interval_days
+    FROM learning_progress
+    WHERE telegram_id = ? AND word_id = ?
+    """
+# New cards start at one repetition; existing ones count up in place
+SQL_UPSERT_REVIEWED_PROGRESS = """
+    INSERT INTO learning_progress (
+        telegram_id, word_id, repetitions, easiness_factor,
+        interval_days, next_review_date, last_reviewed, created_at, updated_at
+    )
+    VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(telegram_id, word_id) DO UPDATE SET
+        repetitions = learning_progress.repetitions + 1,
+        easiness_factor = excluded.easiness_factor,
+        interval_days = excluded.interval_days,
+        next_review_date = excluded.next_review_date,
+        last_reviewed = excluded.last_reviewed,
+        updated_at = excluded.updated_at
+    """
+SQL_INSERT_REVIEW = """
+    INSERT INTO review_history (telegram_id, word_id, rating, response_time_ms, reviewed_at)
+    VALUES (?, ?, ?, ?, ?)
+    """
+SQL_LEARNING_PROGRESS = """
+    SELECT * FROM learning_progress
+    WHERE telegram_id = ? AND word_id = ?
+    """
+SQL_WORD_REVIEW_HISTORY = """
+    SELECT * FROM review_history
+    WHERE telegram_id = ? AND word_id = ?
+    ORDER BY reviewed_at DESC
+    LIMIT ?
+    """
+SQL_USER_REVIEW_HISTORY = """
+    SELECT * FROM review_history
+    WHERE telegram_id = ?
+    ORDER BY reviewed_at DESC
+    LIMIT ?
+    """
+SQL_RECENT_REVIEWS = """
+    SELECT rh.*, w.lemma, w.translation
+    FROM review_history rh
+    JOIN words w ON rh.word_id = w.id
+    WHERE rh.telegram_id = ? AND rh.reviewed_at >= datetime('now', ?)
+    ORDER BY rh.reviewed_at DESC
+    """
+SQL_PERFORMANCE_STATS = """
+    SELECT
+        COUNT(*) as total_reviews,
+        AVG(rating) as avg_rating,
+        SUM(CASE WHEN rating >= 3 THEN 1 ELSE 0 END) as good_reviews,
+        AVG(response_time_ms) as avg_response_time
+    FROM review_history
+    WHERE telegram_id = ? AND reviewed_at >= datetime('now', ?)
+    """
+
 
 class ProgressRepository:
     """Repository for learning progress and review history operations"""
 
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
+        # The same card is read for rendering, rating and re-queueing within
+        # seconds; every write below drops its (telegram_id, word_id) entry
+        self._progress_cache = RowCache()
 
     def update_learning_progress(
         self,
@@ -28,118 +95,135 @@ class ProgressRepository:
         response_time_ms: int = 0,
     ) -> bool:
         """Update learning progress after review"""
+        # One timestamp for the whole review, so last_reviewed, updated_at and
+        # the history row agree to the microsecond
+        now = datetime.now()
         try:
             with self.db_connection.get_connection() as conn:
-                # Get current progress
-                cursor = conn.execute(
-                    """
-                    SELECT repetitions, easiness_factor, interval_days
-                    FROM learning_progress
-                    WHERE telegram_id = ? AND word_id = ?
-                    """,
-                    (telegram_id, word_id),
-                )
-
-                current = cursor.fetchone()
+                # Hold the write lock from the read through the upsert so a
+                # concurrent review of the same card cannot slip in between
+                conn.execute("BEGIN IMMEDIATE")
+                current = conn.execute(
+                    SQL_REVIEW_STATE, (telegram_id, word_id)
+                ).fetchone()
                 if not current:
                     logger.info(
                         f"No learning progress found for telegram_id {telegram_id}, word {word_id}. "
                         "Creating initial record."
                     )
-                    # Set initial values for calculation
-                    current = {
+
+                # A first review always goes through the SRS from the initial
+                # state; explicit values only override an existing card
+                if not current or new_interval is None or new_easiness is None:
+                    state = current or {
                         "repetitions": 0,
                         "easiness_factor": 2.5,
                         "interval_days": 1,
                     }
-
-                    # Create initial learning progress record with calculated values
-                    # We'll calculate the new values first, then insert them directly
-                    from ....spaced_repetition import get_srs_system
-
-                    srs = get_srs_system()
-                    result = srs.calculate_review(
+                    result = get_srs_system().calculate_review(
                         rating,
-                        current["repetitions"],
-                        current["interval_days"],
-                        current["easiness_factor"],
+                        state["repetitions"],
+                        state["interval_days"],
+                        state["easiness_factor"],
                     )
+                    new_interval = result.new_interval
+                    new_easiness = result.new_easiness_factor
 
-                    # Calculate next review date
-                    next_review_date = datetime.now()
-                    if result.new_interval > 0:
-                        from datetime import timedelta
+                next_review_date = now
+                if new_interval > 0:
+                    next_review_date = now + timedelta(days=new_interval)
 
-                        next_review_date = datetime.now() + timedelta(
-                            days=result.new_interval
-                        )
+                conn.execute(
+                    SQL_UPSERT_REVIEWED_PROGRESS,
+                    (
+                        telegram_id,
+                        word_id,
+                        new_easiness,
+                        new_interval,
+                        next_review_date,
+                        now,
+                        now,
+                        now,
+                    ),
+                )
+                conn.execute(
+                    SQL_INSERT_REVIEW,
+                    (telegram_id, word_id, rating, response_time_ms, now),
+                )
 
-                    cursor = conn.execute(
-                        """
-                        INSERT INTO learning_progress (
-                            telegram_id, word_id, repetitions, easiness_factor,
-                            interval_days, next_review_date, last_reviewed, created_at, updated_at
-                        )
-                        VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            telegram_id,
-                            word_id,
-                            result.new_easiness_factor,
-                            result.new_interval,
-                            next_review_date,
-                            datetime.now(),
-                            datetime.now(),
-                            datetime.now(),
-                        ),
-                    )
+                conn.commit()
+                self._progress_cache.pop((telegram_id, word_id))
+                return True
 
-                    # Add to review history
-                    cursor = conn.execute(
-                        """
-                        INSERT INTO review_history (telegram_id, word_id, rating, response_time_ms, reviewed_at)
-                        VALUES (?, ?, ?, ?, ?)
-                        """,
-                        (
-                            telegram_id,
-                            word_id,
-                            rating,
-                            response_time_ms,
-                            datetime.now(),
-                        ),
-                    )
+        except Exception as e:
+            logger.error(f"Error updating learning progress: {e}")
+            return False
 
-                    conn.commit()
-                    return True
-                else:
-                    # Convert row to dict for consistent access
-                    current = dict(current)
+    def bulk_update_learning_progress(
+        self, telegram_id: int, reviews: list[tuple[int, int, int]]
+    ) -> bool:
+        """Apply a batch of (word_id, rating, response_time_ms) reviews at once.
+
+        Same outcome as calling update_learning_progress per review, in order,
+        but inside a single transaction: one commit for the whole batch instead
+        of one per card.
+        """
+        if not reviews:
+            return True
 
-                # Calculate new values if not provided
-                if new_interval is None or new_easiness is None:
-                    from ....spaced_repetition import get_srs_system
+        now = datetime.now()
+        srs = get_srs_system()
+        try:
+            with self.db_connection.get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
 
-                    srs = get_srs_system()
+                word_ids = sorted({word_id for word_id, _, _ in reviews})
+                cursor = conn.execute(
+                    """
+                    SELECT word_id, repetitions, easiness_factor, interval_days
+                    FROM learning_progress
+                    WHERE telegram_id = ?
+                      AND word_id IN (SELECT value FROM json_each(?))
+                    """,
+                    (telegram_id, json.dumps(word_ids)),
+                )
+                # Rows are only read by key and then replaced, never mutated,
+                # so they stay sqlite3.Row rather than being copied to dicts
+                current = {row["word_id"]: row for row in cursor}
+                existing = set(current)
+
+                # A word rated twice in one batch builds on its first rating
+                history_rows = []
+                for word_id, rating, response_time_ms in reviews:
+                    state = current.get(word_id) or {
+                        "repetitions": 0,
+                        "easiness_factor": 2.5,
+                        "interval_days": 1,
+                    }
                     result = srs.calculate_review(
                         rating,
-                        current["repetitions"],
-                        current["interval_days"],
-                        current["easiness_factor"],
+                        state["repetitions"],
+                        state["interval_days"],
+                        state["easiness_factor"],
                     )
-                    new_interval = result.new_interval
-                    new_easiness = result.new_easiness_factor
-
-                # Update learning progress
-                next_review_date = datetime.now()
-                if new_interval > 0:
-                    from datetime import timedelta
+                    next_review_date = now
+                    if result.new_interval > 0:
+                        next_review_date = now + timedelta(days=result.new_interval)
 
-                    next_review_date = datetime.now() + timedelta(days=new_interval)
+                    current[word_id] = {
+                        "repetitions": state["repetitions"] + 1,
+                        "easiness_factor": result.new_easiness_factor,
+                        "interval_days": result.new_interval,
+                        "next_review_date": next_review_date,
+                    }
+                    history_rows.append(
+                        (telegram_id, word_id, rating, response_time_ms, now)
+                    )
 
-                cursor = conn.execute(
+                conn.executemany(
                     """
                     UPDATE learning_progress
-                    SET repetitions = repetitions + 1,
+                    SET repetitions = ?,
                         easiness_factor = ?,
                         interval_days = ?,
                         next_review_date = ?,
@@ -147,48 +231,73 @@ class ProgressRepository:
                         updated_at = ?
                     WHERE telegram_id = ? AND word_id = ?
                     """,
-                    (
-                        new_easiness,
-                        new_interval,
-                        next_review_date,
-                        datetime.now(),
-                        datetime.now(),
-                        telegram_id,
-                        word_id,
-                    ),
+                    [
+                        (
+                            state["repetitions"],
+                            state["easiness_factor"],
+                            state["interval_days"],
+                            state["next_review_date"],
+                            now,
+                            now,
+                            telegram_id,
+                            word_id,
+                        )
+                        for word_id, state in current.items()
+                        if word_id in existing
+                    ],
                 )
-
-                # Add to review history
-                cursor = conn.execute(
+                conn.executemany(
                     """
-                    INSERT INTO review_history (telegram_id, word_id, rating, response_time_ms, reviewed_at)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO learning_progress (
+                        telegram_id, word_id, repetitions, easiness_factor,
+                        interval_days, next_review_date, last_reviewed, created_at, updated_at
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
-                    (telegram_id, word_id, rating, response_time_ms, datetime.now()),
+                    [
+                        (
+                            telegram_id,
+                            word_id,
+                            state["repetitions"],
+                            state["easiness_factor"],
+                            state["interval_days"],
+                            state["next_review_date"],
+                            now,
+                            now,
+                            now,
+                        )
+                        for word_id, state in current.items()
+                        if word_id not in existing
+                    ],
                 )
+                conn.executemany(SQL_INSERT_REVIEW, history_rows)
 
                 conn.commit()
+                for word_id in word_ids:
+                    self._progress_cache.pop((telegram_id, word_id))
                 return True
 
         except Exception as e:
-            logger.error(f"Error updating learning progress: {e}")
+            logger.error(f"Error bulk updating learning progress: {e}")
             return False
 
     def get_learning_progress(
         self, telegram_id: int, word_id: int
     ) -> LearningProgress | None:
         """Get learning progress for a specific word"""
+        cached = self._progress_cache.get((telegram_id, word_id))
+        if cached is not None:
+            return cached
+
         try:
-            with self.db_connection.get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    SELECT * FROM learning_progress
-                    WHERE telegram_id = ? AND word_id = ?
-                    """,
-                    (telegram_id, word_id),
-                )
+            with self.db_connection.get_reader() as conn:
+                cursor = conn.execute(SQL_LEARNING_PROGRESS, (telegram_id, word_id))
                 row = cursor.fetchone()
-                return dict(row) if row else None
+                if not row:
+                    return None
+                progress = dict(row)
+                self._progress_cache.set((telegram_id, word_id), progress)
+                return progress
         except Exception as e:
             logger.error(f"Error getting learning progress: {e}")
             return None
@@ -198,37 +307,45 @@ class ProgressRepository:
     ) -> list[ReviewHistory]:
         """Get review history for user or specific word"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 if word_id:
                     cursor = conn.execute(
-                        """
-                        SELECT * FROM review_history
-                        WHERE telegram_id = ? AND word_id = ?
-                        ORDER BY reviewed_at DESC
-                        LIMIT ?
-                        """,
-                        (telegram_id, word_id, limit),
+                        SQL_WORD_REVIEW_HISTORY, (telegram_id, word_id, limit)
                     )
                 else:
-                    cursor = conn.execute(
-                        """
-                        SELECT * FROM review_history
-                        WHERE telegram_id = ?
-                        ORDER BY reviewed_at DESC
-                        LIMIT ?
-                        """,
-                        (telegram_id, limit),
-                    )
+                    cursor = conn.execute(SQL_USER_REVIEW_HISTORY, (telegram_id, limit))
 
-                return [dict(row) for row in cursor.fetchall()]
+                return [dict(row) for row in cursor]
         except Exception as e:
             logger.error(f"Error getting review history: {e}")
             return []
 
+    def iter_review_history(
+        self, telegram_id: int, word_id: int | None = None, limit: int = 100
+    ) -> Iterator[ReviewHistory]:
+        """Yield review history newest first, one row at a time.
+
+        The connection stays open until the caller finishes or closes the
+        iterator, so stop early (or close it) once enough rows are seen.
+        """
+        try:
+            with self.db_connection.get_reader() as conn:
+                if word_id:
+                    cursor = conn.execute(
+                        SQL_WORD_REVIEW_HISTORY, (telegram_id, word_id, limit)
+                    )
+                else:
+                    cursor = conn.execute(SQL_USER_REVIEW_HISTORY, (telegram_id, limit))
+
+                for row in cursor:
+                    yield dict(row)
+        except Exception as e:
+            logger.error(f"Error iterating review history: {e}")
+
     def has_reviewed_today(self, telegram_id: int) -> bool:
         """Check whether the user has already reviewed at least one word today"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     """
                     SELECT 1 FROM review_history
@@ -247,18 +364,11 @@ class ProgressRepository:
     ) -> list[dict[str, Any]]:
         """Get recent reviews with word information"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
-                    """
-                    SELECT rh.*, w.lemma, w.translation
-                    FROM review_history rh
-                    JOIN words w ON rh.word_id = w.id
-                    WHERE rh.telegram_id = ? AND rh.reviewed_at >= datetime('now', ?)
-                    ORDER BY rh.reviewed_at DESC
-                    """,
-                    (telegram_id, f"-{int(days)} days"),
+                    SQL_RECENT_REVIEWS, (telegram_id, f"-{int(days)} days")
                 )
-                return [dict(row) for row in cursor.fetchall()]
+                return [dict(row) for row in cursor]
         except Exception as e:
             logger.error(f"Error getting recent reviews: {e}")
             return []
@@ -266,18 +376,9 @@ class ProgressRepository:
     def get_performance_stats(self, telegram_id: int, days: int = 30) -> dict[str, Any]:
         """Get performance statistics for user"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
-                    """
-                    SELECT
-                        COUNT(*) as total_reviews,
-                        AVG(rating) as avg_rating,
-                        SUM(CASE WHEN rating >= 3 THEN 1 ELSE 0 END) as good_reviews,
-                        AVG(response_time_ms) as avg_response_time
-                    FROM review_history
-                    WHERE telegram_id = ? AND reviewed_at >= datetime('now', ?)
-                    """,
-                    (telegram_id, f"-{int(days)} days"),
+                    SQL_PERFORMANCE_STATS, (telegram_id, f"-{int(days)} days")
                 )
 
                 row = cursor.fetchone()
@@ -313,7 +414,7 @@ class ProgressRepository:
         what keeps failing.
         """
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     """
                     WITH card AS (
@@ -359,6 +460,7 @@ class ProgressRepository:
 
     def reset_word_progress(self, telegram_id: int, word_id: int) -> bool:
         """Reset learning progress for a specific word"""
+        now = datetime.now()
         try:
             with self.db_connection.get_connection() as conn:
                 cursor = conn.execute(
@@ -372,10 +474,11 @@ class ProgressRepository:
                         updated_at = ?
                     WHERE telegram_id = ? AND word_id = ?
                     """,
-                    (datetime.now(), datetime.now(), telegram_id, word_id),
+                    (now, now, telegram_id, word_id),
                 )
 
                 conn.commit()
+                self._progress_cache.pop((telegram_id, word_id))
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error resetting word progress: {e}")
@@ -406,6 +509,7 @@ class ProgressRepository:
                 )
 
                 conn.commit()
+                self._progress_cache.pop((telegram_id, word_id))
                 logger.info(
                     f"Created learning progress for telegram_id {telegram_id}, word {word_id}"
                 )
@@ -431,6 +535,7 @@ class ProgressRepository:
                 )
 
                 conn.commit()
+                self._progress_cache.pop((telegram_id, word_id))
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deleting word progress: {e}")
@@ -5,17 +5,54 @@ User repository for database operations
 import logging
 from datetime import datetime, timedelta
 
+from ..cache import RowCache
 from ..connection import DatabaseConnection
 from ..models import User, UserStats
 
 logger = logging.getLogger(__name__)
 
+# The reviews_today range check is a coarse, index-friendly bound: any review
+# whose local date is today falls on or after yesterday's UTC date, and the
+# exact localtime comparison then runs only on that slice.
+SQL_USER_STATS = """
+    WITH progress AS (
+        SELECT
+            COUNT(*) as total_words,
+            SUM(CASE WHEN lp.repetitions = 0 THEN 1 ELSE 0 END) as new_words,
+            SUM(CASE WHEN datetime(lp.next_review_date) <= datetime('now', 'localtime') AND lp.repetitions > 0 THEN 1 ELSE 0 END) as due_words,
+            SUM(CASE WHEN lp.repetitions >= 3 THEN 1 ELSE 0 END) as learned_words,
+            SUM(CASE WHEN lp.easiness_factor < 2.0 THEN 1 ELSE 0 END) as difficult_words,
+            SUM(CASE WHEN date(lp.created_at) = date('now', 'localtime') THEN 1 ELSE 0 END) as words_today
+        FROM learning_progress lp
+        WHERE lp.telegram_id = ?
+    ),
+    recent AS (
+        SELECT
+            COUNT(*) as total_reviews,
+            SUM(CASE WHEN rating >= 3 THEN 1 ELSE 0 END) as correct_reviews,
+            SUM(CASE WHEN rating < 3 THEN 1 ELSE 0 END) as incorrect_reviews
+        FROM review_history
+        WHERE telegram_id = ? AND reviewed_at >= datetime('now', '-30 days')
+    ),
+    today AS (
+        SELECT COUNT(DISTINCT word_id) as reviews_today
+        FROM review_history
+        WHERE telegram_id = ?
+          AND reviewed_at >= date('now', '-1 day')
+          AND date(reviewed_at, 'localtime') = date('now', 'localtime')
+    )
+    SELECT * FROM progress, recent, today
+    """
+
 
 class UserRepository:
     """Repository for user-related database operations"""
 
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
+        # Looked up on every Telegram update and almost never written;
+        # update_user and deactivate_user drop the entry they change
+        self._user_cache = RowCache(ttl=60.0)
 
     def create_user(
         self,
@@ -25,33 +62,48 @@ class UserRepository:
         username: str | None = None,
     ) -> User | None:
         """Create a new user"""
+        # telegram_id is the rowid alias: a NULL would be silently replaced by
+        # a generated id instead of failing the insert
+        if telegram_id is None:
+            logger.error("Error creating user: telegram_id is required")
+            return None
+
         try:
             with self.db_connection.get_connection() as conn:
-                conn.execute(
+                # RETURNING hands back the stored row, defaults included
+                cursor = conn.execute(
                     """
                     INSERT INTO users (telegram_id, first_name, last_name, username)
                     VALUES (?, ?, ?, ?)
+                    RETURNING *
                     """,
                     (telegram_id, first_name, last_name, username),
                 )
+                user = dict(cursor.fetchone())
 
                 conn.commit()
-
-                # Return the created user
-                return self.get_user_by_telegram_id(telegram_id)
+                return user
         except Exception as e:
             logger.error(f"Error creating user: {e}")
             return None
 
     def get_user_by_telegram_id(self, telegram_id: int) -> User | None:
         """Get user by Telegram ID"""
+        cached = self._user_cache.get(telegram_id)
+        if cached is not None:
+            return cached
+
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     "SELECT * FROM users WHERE telegram_id = ?", (telegram_id,)
                 )
                 row = cursor.fetchone()
-                return dict(row) if row else None
+                if not row:
+                    return None
+                user = dict(row)
+                self._user_cache.set(telegram_id, user)
+                return user
         except Exception as e:
             logger.error(f"Error getting user by Telegram ID: {e}")
             return None
@@ -77,18 +129,13 @@ class UserRepository:
                     SET first_name = COALESCE(?, first_name),
                         last_name = COALESCE(?, last_name),
                         username = COALESCE(?, username),
-                        updated_at = ?
+                        updated_at = CURRENT_TIMESTAMP
                     WHERE telegram_id = ?
                     """,
-                    (
-                        first_name,
-                        last_name,
-                        username,
-                        datetime.now(),
-                        telegram_id,
-                    ),
+                    (first_name, last_name, username, telegram_id),
                 )
                 conn.commit()
+                self._user_cache.pop(telegram_id)
 
                 return cursor.rowcount > 0
         except Exception as e:
@@ -100,10 +147,12 @@ class UserRepository:
         try:
             with self.db_connection.get_connection() as conn:
                 cursor = conn.execute(
-                    "UPDATE users SET is_active = 0, updated_at = ? WHERE telegram_id = ?",
-                    (datetime.now(), telegram_id),
+                    "UPDATE users SET is_active = 0, updated_at = CURRENT_TIMESTAMP"
+                    " WHERE telegram_id = ?",
+                    (telegram_id,),
                 )
                 conn.commit()
+                self._user_cache.pop(telegram_id)
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error deactivating user: {e}")
@@ -112,7 +161,7 @@ class UserRepository:
     def get_all_active_users(self) -> list[User]:
         """Get all active users"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute("SELECT * FROM users WHERE is_active = 1")
                 rows = cursor.fetchall()
                 return [dict(row) for row in rows] if rows else []
@@ -123,21 +172,11 @@ class UserRepository:
     def get_user_stats(self, telegram_id: int) -> UserStats | None:
         """Get comprehensive user statistics"""
         try:
-            with self.db_connection.get_connection() as conn:
-                # Get basic word counts
+            with self.db_connection.get_reader() as conn:
+                # Word counts, the 30-day review split and today's activity
+                # in one statement: each CTE walks its own index range once
                 cursor = conn.execute(
-                    """
-                    SELECT
-                        COUNT(*) as total_words,
-                        SUM(CASE WHEN lp.repetitions = 0 THEN 1 ELSE 0 END) as new_words,
-                        SUM(CASE WHEN datetime(lp.next_review_date) <= datetime('now', 'localtime') AND lp.repetitions > 0 THEN 1 ELSE 0 END) as due_words,
-                        SUM(CASE WHEN lp.repetitions >= 3 THEN 1 ELSE 0 END) as learned_words,
-                        SUM(CASE WHEN lp.easiness_factor < 2.0 THEN 1 ELSE 0 END) as difficult_words,
-                        SUM(CASE WHEN date(lp.created_at) = date('now', 'localtime') THEN 1 ELSE 0 END) as words_today
-                    FROM learning_progress lp
-                    WHERE lp.telegram_id = ?
-                    """,
-                    (telegram_id,),
+                    SQL_USER_STATS, (telegram_id, telegram_id, telegram_id)
                 )
 
                 row = cursor.fetchone()
@@ -145,41 +184,13 @@ class UserRepository:
                     return None
 
                 stats = dict(row)
-
-                # Get review accuracy (correct/incorrect) from recent reviews
-                cursor = conn.execute(
-                    """
-                    SELECT
-                        COUNT(*) as total_reviews,
-                        SUM(CASE WHEN rating >= 3 THEN 1 ELSE 0 END) as correct_reviews,
-                        SUM(CASE WHEN rating < 3 THEN 1 ELSE 0 END) as incorrect_reviews
-                    FROM review_history
-                    WHERE telegram_id = ? AND reviewed_at >= datetime('now', '-30 days')
-                    """,
-                    (telegram_id,),
-                )
-
-                accuracy_row = cursor.fetchone()
-                total_reviews = accuracy_row["total_reviews"] or 0
-                stats["correct_reviews"] = accuracy_row["correct_reviews"] or 0
-                stats["incorrect_reviews"] = accuracy_row["incorrect_reviews"] or 0
+                total_reviews = stats.pop("total_reviews") or 0
+                stats["correct_reviews"] = stats["correct_reviews"] or 0
+                stats["incorrect_reviews"] = stats["incorrect_reviews"] or 0
                 stats["average_accuracy"] = (
                     stats["correct_reviews"] / total_reviews if total_reviews else 0.0
                 )
-
-                # Get today's activity
-                cursor = conn.execute(
-                    """
-                    SELECT
-                        COUNT(DISTINCT word_id) as reviews_today
-                    FROM review_history
-                    WHERE telegram_id = ? AND date(reviewed_at, 'localtime') = date('now', 'localtime')
-                    """,
-                    (telegram_id,),
-                )
-
-                today_row = cursor.fetchone()
-                stats["reviews_today"] = today_row["reviews_today"] if today_row else 0
+                stats["reviews_today"] = stats["reviews_today"] or 0
 
                 # Calculate study streak: consecutive days (ending today or
                 # yesterday) with at least one review
@@ -4,18 +4,43 @@ Word repository for database operations
 
 import json
 import logging
+import random
+import re
+import sqlite3
+import string
+from collections.abc import Iterator
 from typing import Any
 
+from ..cache import RowCache
 from ..connection import DatabaseConnection
 from ..models import Word
 
 logger = logging.getLogger(__name__)
 
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def sqlite_lower(text: str) -> str:
+    """Lowercase text the way SQLite's built-in LOWER() does.
+
+    LOWER() folds ASCII letters only, so "Übung" stays "Übung". Lemmas
+    compared in Python against LOWER() results must be folded with this
+    rather than str.lower(), or the answer depends on which side ran it.
+    """
+    return text.translate(_ASCII_LOWER)
+
+
 # Study queries are assembled here, at import time, from literal fragments:
 # every statement below is a constant by the time anything runs, so no value
 # a user can influence ever reaches the SQL text.
+#
+# Study cards read only what a card shows and schedules: the words table's
+# confidence and timestamps are left out, which also spares two datetime
+# conversions per row.
 _SELECT_STUDY_WORDS = """
-    SELECT w.*, lp.repetitions, lp.easiness_factor, lp.interval_days,
+    SELECT w.id, w.lemma, w.part_of_speech, w.article, w.translation,
+           w.example, w.additional_forms, w.level,
+           lp.repetitions, lp.easiness_factor, lp.interval_days,
            lp.next_review_date, lp.last_reviewed
     FROM words w
     JOIN learning_progress lp ON w.id = lp.word_id
@@ -48,6 +73,26 @@ SQL_DIFFICULT_WORDS = (
     + _ORDER_RANDOM_OR
     + _BY_EASINESS
 )
+
+# Candidate ids for the randomized paths of the three core study queries.
+# Sampling k ids in Python and re-reading just those rows avoids sorting the
+# whole candidate set by RANDOM() to keep a handful of them.
+SQL_DUE_WORD_IDS = """
+    SELECT lp.word_id FROM learning_progress lp
+    WHERE lp.telegram_id = ?
+      AND datetime(lp.next_review_date) <= datetime('now', 'localtime')
+    """
+SQL_NEW_WORD_IDS = """
+    SELECT lp.word_id FROM learning_progress lp
+    WHERE lp.telegram_id = ? AND lp.repetitions = 0
+    """
+SQL_DIFFICULT_WORD_IDS = """
+    SELECT lp.word_id FROM learning_progress lp
+    WHERE lp.telegram_id = ? AND lp.easiness_factor < 2.0 AND lp.repetitions > 0
+    """
+_ID_IN_JSON_ARRAY = "w.id IN (SELECT value FROM json_each(?))"
+
+SQL_STUDY_WORDS_BY_IDS = _SELECT_STUDY_WORDS + _ID_IN_JSON_ARRAY
 SQL_VERB_WORDS = (
     _SELECT_STUDY_WORDS + "w.part_of_speech = 'verb'" + _ORDER_RANDOM_OR + _BY_CREATED
 )
@@ -204,6 +249,92 @@ _LEMMA_IN_JSON_ARRAY = "LOWER(w.lemma) IN (SELECT value FROM json_each(?))"
 SQL_WORDS_BY_LEMMA_SET = (
     _SELECT_STUDY_WORDS + _LEMMA_IN_JSON_ARRAY + _ORDER_RANDOM_OR + _BY_CREATED
 )
+# Lemma lookups lead with the words table so they seek idx_words_lemma_lower
+# and then probe the user's (telegram_id, word_id) key, rather than walking
+# every progress row of the user and lowercasing each lemma. CROSS JOIN pins
+# that order for the planner. Both sides go through SQLite's LOWER, which
+# folds ASCII only: lowering the wanted forms in Python instead would turn
+# "Übung" into "übung" and miss the stored lemma. Rows carry the requested
+# form as bound, so callers map results back by exact string.
+SQL_EXISTING_LEMMAS = """
+    SELECT wanted.value FROM json_each(?) AS wanted
+    CROSS JOIN words w
+    CROSS JOIN learning_progress lp
+    WHERE LOWER(w.lemma) = LOWER(wanted.value)
+      AND lp.telegram_id = ? AND lp.word_id = w.id
+    """
+
+
+# Batch insert for add_words_to_user: the trailing lemma parameter skips words
+# already stored under any letter case, including earlier rows of the batch
+SQL_INSERT_MISSING_WORD = """
+    INSERT OR IGNORE INTO words (
+        lemma, part_of_speech, article, translation,
+        example, additional_forms, confidence, level
+    )
+    SELECT ?, ?, ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (SELECT 1 FROM words WHERE LOWER(lemma) = LOWER(?))
+    """
+# Each requested lemma alongside the stored word it resolves to, oldest first
+SQL_WORDS_FOR_LEMMAS = """
+    SELECT wanted.value AS wanted, w.*
+    FROM json_each(?) AS wanted
+    JOIN words w ON LOWER(w.lemma) = LOWER(wanted.value)
+    ORDER BY w.id
+    """
+# Progress rows for a whole batch of word ids, in request order. The
+# UNIQUE(telegram_id, word_id) constraint is the duplicate check: a word the
+# user already has (or a repeat within the batch) inserts nothing, so
+# RETURNING lists exactly the words that were added. WHERE true keeps the
+# parser from reading ON CONFLICT as a join constraint.
+SQL_INSERT_NEW_PROGRESS = """
+    INSERT INTO learning_progress (
+        telegram_id, word_id, repetitions, easiness_factor,
+        interval_days, next_review_date
+    )
+    SELECT ?, value, 0, 2.5, 1, datetime('now')
+    FROM json_each(?)
+    WHERE true
+    ORDER BY key
+    ON CONFLICT(telegram_id, word_id) DO NOTHING
+    RETURNING word_id
+    """
+
+# Details for each requested lemma the user has; position is the lemma's
+# index in the request, so case variants of one lemma collapse to one row
+SQL_EXISTING_WORDS_DETAILS = """
+    SELECT wanted.key AS position, w.lemma, w.part_of_speech, w.article,
+           w.translation, w.example, w.additional_forms
+    FROM json_each(?) AS wanted
+    JOIN words w ON LOWER(w.lemma) = LOWER(wanted.value)
+    JOIN learning_progress lp ON w.id = lp.word_id AND lp.telegram_id = ?
+    ORDER BY w.id
+    """
+
+
+# One page of a user's words, newest first. The keyset is the progress row's
+# (created_at, id); created_at is read back as raw text so the next page binds
+# exactly what is stored rather than a converted datetime. created_at is
+# nullable, so it is keyed as COALESCE(created_at, ''): NULL rows sort last
+# and a page ending on one binds '' rather than the first-page NULL.
+SQL_USER_WORDS_PAGE = """
+    SELECT w.*, lp.repetitions, lp.easiness_factor, lp.interval_days,
+           lp.next_review_date, lp.last_reviewed,
+           COALESCE(lp.created_at, '') AS page_created_at,
+           lp.id AS page_progress_id
+    FROM words w
+    JOIN learning_progress lp ON w.id = lp.word_id
+    WHERE lp.telegram_id = ?
+      AND (? IS NULL OR (COALESCE(lp.created_at, ''), lp.id) < (?, ?))
+    ORDER BY COALESCE(lp.created_at, '') DESC, lp.id DESC
+    LIMIT ?
+    """
+
+
+# Placeholders the translation step leaves behind when it fails, such as
+# "[translation unavailable]", "[error]" or "[failed]". They match anywhere in
+# the text, in any case, in a single pass.
+_INVALID_TRANSLATION = re.compile("unavailable|error|failed", re.IGNORECASE)
 
 
 class WordRepository:
@@ -211,6 +342,9 @@ class WordRepository:
 
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
+        # Words are shared and never edited in place, so a lemma lookup is
+        # safe to serve from memory until the TTL lapses
+        self._lemma_cache = RowCache()
 
     def create_word(self, word_data: dict[str, Any]) -> Word | None:
         """Create a new word"""
@@ -223,6 +357,7 @@ class WordRepository:
                         example, additional_forms, confidence, level
                     )
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    RETURNING *
                     """,
                     (
                         word_data.get("lemma"),
@@ -236,11 +371,11 @@ class WordRepository:
                     ),
                 )
 
-                word_id = cursor.lastrowid
-                conn.commit()
+                # RETURNING hands back the stored row, defaults included
+                word = dict(cursor.fetchone())
 
-                # Return the created word
-                return self.get_word_by_id(word_id)
+                conn.commit()
+                return word
         except Exception as e:
             logger.error(f"Error creating word: {e}")
             return None
@@ -248,7 +383,7 @@ class WordRepository:
     def get_word_by_id(self, word_id: int) -> Word | None:
         """Get word by ID"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute("SELECT * FROM words WHERE id = ?", (word_id,))
                 row = cursor.fetchone()
                 return dict(row) if row else None
@@ -258,11 +393,19 @@ class WordRepository:
 
     def get_word_by_lemma(self, lemma: str) -> Word | None:
         """Get word by lemma"""
+        cached = self._lemma_cache.get(lemma)
+        if cached is not None:
+            return cached
+
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute("SELECT * FROM words WHERE lemma = ?", (lemma,))
                 row = cursor.fetchone()
-                return dict(row) if row else None
+                if not row:
+                    return None
+                word = dict(row)
+                self._lemma_cache.set(lemma, word)
+                return word
         except Exception as e:
             logger.error(f"Error getting word by lemma: {e}")
             return None
@@ -270,16 +413,19 @@ class WordRepository:
     def check_word_exists(self, telegram_id: int, lemma: str) -> bool:
         """Check if word exists in user's learning progress"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     """
-                    SELECT 1 FROM learning_progress lp
-                    JOIN words w ON lp.word_id = w.id
-                    WHERE lp.telegram_id = ? AND LOWER(w.lemma) = LOWER(?)
+                    SELECT EXISTS (
+                        SELECT 1 FROM words w
+                        CROSS JOIN learning_progress lp
+                        WHERE LOWER(w.lemma) = LOWER(?)
+                          AND lp.telegram_id = ? AND lp.word_id = w.id
+                    )
                     """,
-                    (telegram_id, lemma),
+                    (lemma, telegram_id),
                 )
-                return cursor.fetchone() is not None
+                return bool(cursor.fetchone()[0])
         except Exception as e:
             logger.error(f"Error checking word existence: {e}")
             return False
@@ -289,60 +435,131 @@ class WordRepository:
     ) -> dict[str, bool]:
         """Check existence of multiple words at once"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
+                cursor = conn.execute(
+                    SQL_EXISTING_LEMMAS,
+                    (json.dumps(list(dict.fromkeys(lemmas))), telegram_id),
+                )
+                existing_lemmas = {row[0] for row in cursor}
+                return {lemma: lemma in existing_lemmas for lemma in lemmas}
+        except Exception as e:
+            logger.error(f"Error checking multiple words existence: {e}")
+            return dict.fromkeys(lemmas, False)
+
+    def get_all_user_lemmas(self, telegram_id: int) -> set[str]:
+        """Get every lemma the user is learning, folded by sqlite_lower"""
+        try:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     """
-                    SELECT w.lemma FROM learning_progress lp
+                    SELECT LOWER(w.lemma) FROM learning_progress lp
                     JOIN words w ON lp.word_id = w.id
                     WHERE lp.telegram_id = ?
-                      AND LOWER(w.lemma) IN (SELECT value FROM json_each(?))
                     """,
-                    (telegram_id, json.dumps([lemma.lower() for lemma in lemmas])),
+                    (telegram_id,),
                 )
+                return {row[0] for row in cursor}
+        except Exception as e:
+            logger.error(f"Error getting user lemmas: {e}")
+            return set()
+
+    def filter_existing_lemmas(self, telegram_id: int, lemmas: list[str]) -> list[str]:
+        """Return the lemmas the user already has, case-insensitively, in input order"""
+        if not lemmas:
+            return []
 
-                existing_lemmas = {row["lemma"].lower() for row in cursor.fetchall()}
-                result = {lemma: lemma.lower() in existing_lemmas for lemma in lemmas}
-                return result
+        try:
+            with self.db_connection.get_reader() as conn:
+                cursor = conn.execute(
+                    SQL_EXISTING_LEMMAS,
+                    (json.dumps(list(dict.fromkeys(lemmas))), telegram_id),
+                )
+                found = {row[0] for row in cursor}
+                return [lemma for lemma in lemmas if lemma in found]
         except Exception as e:
-            logger.error(f"Error checking multiple words existence: {e}")
-            return dict.fromkeys(lemmas, False)
+            logger.error(f"Error filtering existing lemmas: {e}")
+            return []
 
     def _fetch_study_words(
         self, sql: str, params: tuple, what: str
     ) -> list[dict[str, Any]]:
         """Run one of the module-level study statements"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(sql, params)
                 return [dict(row) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Error getting {what}: {e}")
             return []
 
-    def get_words_by_user(self, telegram_id: int) -> list[dict[str, Any]]:
-        """Get all words for a user with learning progress"""
+    def _sample_study_words(
+        self, ids_sql: str, telegram_id: int, limit: int, what: str
+    ) -> list[dict[str, Any]]:
+        """Pick up to limit random words from the ids ids_sql selects"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
+                ids = [row[0] for row in conn.execute(ids_sql, (telegram_id,))]
+                picked = random.sample(ids, min(max(limit, 0), len(ids)))
+                if not picked:
+                    return []
                 cursor = conn.execute(
-                    """
-                    SELECT w.*, lp.repetitions, lp.easiness_factor, lp.interval_days,
-                           lp.next_review_date, lp.last_reviewed
-                    FROM words w
-                    JOIN learning_progress lp ON w.id = lp.word_id
-                    WHERE lp.telegram_id = ?
-                    ORDER BY lp.created_at DESC
-                    """,
-                    (telegram_id,),
+                    SQL_STUDY_WORDS_BY_IDS, (telegram_id, json.dumps(picked))
                 )
-                return [dict(row) for row in cursor.fetchall()]
+                rows = {row["id"]: dict(row) for row in cursor}
+                return [rows[word_id] for word_id in picked if word_id in rows]
         except Exception as e:
-            logger.error(f"Error getting words by user: {e}")
+            logger.error(f"Error getting {what}: {e}")
             return []
 
+    def get_words_by_user(self, telegram_id: int) -> list[dict[str, Any]]:
+        """Get all words for a user with learning progress.
+
+        Prefer iter_words_by_user for users with many words.
+        """
+        return list(self.iter_words_by_user(telegram_id))
+
+    def iter_words_by_user(
+        self, telegram_id: int, page_size: int = 200
+    ) -> Iterator[dict[str, Any]]:
+        """Yield a user's words newest first, reading page_size rows at a time.
+
+        Each page is its own short query, so no connection or read snapshot
+        is held while the caller works through the rows.
+        """
+        created_at = progress_id = None
+        while True:
+            try:
+                with self.db_connection.get_reader() as conn:
+                    cursor = conn.execute(
+                        SQL_USER_WORDS_PAGE,
+                        (
+                            telegram_id,
+                            created_at,
+                            created_at,
+                            progress_id,
+                            page_size,
+                        ),
+                    )
+                    page = [dict(row) for row in cursor]
+            except Exception as e:
+                logger.error(f"Error getting words by user: {e}")
+                return
+
+            for word in page:
+                created_at = word.pop("page_created_at")
+                progress_id = word.pop("page_progress_id")
+                yield word
+            if len(page) < page_size:
+                return
+
     def get_due_words(
         self, telegram_id: int, limit: int = 10, randomize: bool = True
     ) -> list[dict[str, Any]]:
         """Get words due for review"""
+        if randomize:
+            return self._sample_study_words(
+                SQL_DUE_WORD_IDS, telegram_id, limit, "due words"
+            )
         return self._fetch_study_words(
             SQL_DUE_WORDS, (telegram_id, int(randomize), limit), "due words"
         )
@@ -351,6 +568,10 @@ class WordRepository:
         self, telegram_id: int, limit: int = 10, randomize: bool = True
     ) -> list[dict[str, Any]]:
         """Get new words (never reviewed)"""
+        if randomize:
+            return self._sample_study_words(
+                SQL_NEW_WORD_IDS, telegram_id, limit, "new words"
+            )
         return self._fetch_study_words(
             SQL_NEW_WORDS, (telegram_id, int(randomize), limit), "new words"
         )
@@ -359,6 +580,10 @@ class WordRepository:
         self, telegram_id: int, limit: int = 10, randomize: bool = True
     ) -> list[dict[str, Any]]:
         """Get difficult words (low easiness factor)"""
+        if randomize:
+            return self._sample_study_words(
+                SQL_DIFFICULT_WORD_IDS, telegram_id, limit, "difficult words"
+            )
         return self._fetch_study_words(
             SQL_DIFFICULT_WORDS, (telegram_id, int(randomize), limit), "difficult words"
         )
@@ -552,7 +777,7 @@ class WordRepository:
     def get_topic_slugs(self, telegram_id: int) -> list[str]:
         """Get every topic slug present in the user's cards, alphabetically"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     """
                     SELECT DISTINCT json_extract(w.additional_forms, '$.topic') AS topic
@@ -627,7 +852,7 @@ class WordRepository:
     ) -> list[dict[str, Any]]:
         """Get the most recently added words for study, regardless of SM2 due date"""
         try:
-            with self.db_connection.get_connection() as conn:
+            with self.db_connection.get_reader() as conn:
                 cursor = conn.execute(
                     """
                     SELECT w.*, lp.repetitions, lp.easiness_factor, lp.interval_days,
@@ -649,7 +874,17 @@ class WordRepository:
         self, telegram_id: int, words_data: list[dict[str, Any]]
     ) -> int:
         """Add multiple words to user's learning progress"""
-        return len(self.add_words_with_details(telegram_id, words_data)["added"])
+        return len(self._add_words(telegram_id, words_data)[0]["added"])
+
+    def add_words_returning_rows(
+        self, telegram_id: int, words_data: list[dict[str, Any]]
+    ) -> list[Word]:
+        """Add words and return the rows of those actually added.
+
+        The rows come from the lemma lookup the batch already runs to resolve
+        word ids, so no extra query is needed afterwards.
+        """
+        return self._add_words(telegram_id, words_data)[1]
 
     def add_words_with_details(
         self, telegram_id: int, words_data: list[dict[str, Any]]
@@ -660,139 +895,155 @@ class WordRepository:
         on surface forms, so a word can only be recognized as already learned
         after lemmatization.
         """
+        return self._add_words(telegram_id, words_data)[0]
+
+    def _add_words(
+        self, telegram_id: int, words_data: list[dict[str, Any]]
+    ) -> tuple[dict[str, list[str]], list[Word]]:
+        """Add words, returning the per-lemma outcome and the added rows"""
         added: list[str] = []
+        added_rows: list[Word] = []
         duplicates: list[str] = []
         invalid: list[str] = []
 
-        logger.info(f"Starting to add {len(words_data)} words to user {telegram_id}")
-        for i, word_data in enumerate(words_data):
-            logger.info(
-                f"Word {i + 1}/{len(words_data)}: '{word_data.get('lemma')}' - '{word_data.get('translation')}'"
-            )
+        # Per-word messages are debug-level with lazy arguments: a large batch
+        # should cost no string formatting unless debug logging is on
+        logger.debug("Adding %d words to user %s", len(words_data), telegram_id)
 
         try:
             with self.db_connection.get_connection() as conn:
-                for word_data in words_data:
-                    try:
-                        lemma = word_data.get("lemma")
-                        translation = word_data.get("translation", "")
-
-                        # Validate translation before processing
-                        if not self._is_valid_translation(translation):
-                            logger.warning(
-                                f"SKIP REASON 1: Word '{lemma}' has invalid translation: '{translation}'"
-                            )
-                            invalid.append(str(lemma))
-                            continue
-
-                        # Check if word already exists in shared table (case-insensitive)
-                        cursor = conn.execute(
-                            "SELECT id FROM words WHERE LOWER(lemma) = LOWER(?)",
-                            (lemma,),
+                # The whole batch is one transaction: a lookup, one insert
+                # pass per table, and a single commit
+                conn.execute("BEGIN IMMEDIATE")
+
+                rejected: set[int] = set()
+                for i, word_data in enumerate(words_data):
+                    lemma = word_data.get("lemma")
+                    translation = word_data.get("translation", "")
+
+                    # Validate translation before processing
+                    if not self._is_valid_translation(translation):
+                        logger.warning(
+                            f"SKIP REASON 1: Word '{lemma}' has invalid translation: '{translation}'"
                         )
-                        existing_word = cursor.fetchone()
-
-                        if existing_word:
-                            word_id = existing_word["id"]
-                            logger.debug(
-                                f"Word '{lemma}' already exists in words table with id {word_id}"
-                            )
-                        else:
-                            # Create new word
-                            logger.debug(f"Creating new word entry for '{lemma}'")
-                            cursor = conn.execute(
-                                """
-                                INSERT INTO words (lemma, part_of_speech, article, translation, example, additional_forms, confidence, level)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """,
-                                (
-                                    lemma,
-                                    word_data.get("part_of_speech", "unknown"),
-                                    word_data.get("article"),
-                                    translation,
-                                    word_data.get("example", ""),
-                                    word_data.get("additional_forms"),
-                                    word_data.get("confidence", 1.0),
-                                    word_data.get("level"),
-                                ),
-                            )
-                            word_id = cursor.lastrowid
-                            logger.debug(
-                                f"Created new word '{lemma}' with id {word_id}"
+                        rejected.add(i)
+
+                # Create the words missing from the shared table. Rows run in
+                # order, so a later case variant of a lemma created earlier in
+                # the batch is skipped; OR IGNORE drops rows that violate a
+                # constraint, and those come out below as not stored.
+                new_words = {
+                    i: self._word_insert_params(word_data)
+                    for i, word_data in enumerate(words_data)
+                    if i not in rejected
+                }
+                try:
+                    conn.executemany(SQL_INSERT_MISSING_WORD, new_words.values())
+                except (sqlite3.InterfaceError, sqlite3.ProgrammingError):
+                    # A value sqlite cannot bind fails the whole executemany;
+                    # redo row by row (stored rows are skipped by the guard)
+                    # so only the offending words are lost
+                    for i, params in new_words.items():
+                        try:
+                            conn.execute(SQL_INSERT_MISSING_WORD, params)
+                        except (sqlite3.InterfaceError, sqlite3.ProgrammingError) as e:
+                            logger.error(
+                                f"Error adding word {words_data[i].get('lemma', 'unknown')}: {e}"
                             )
+                            rejected.add(i)
+
+                lemmas = [
+                    word_data.get("lemma")
+                    for i, word_data in enumerate(words_data)
+                    if i not in rejected
+                ]
+                word_rows: dict[str, dict[str, Any]] = {}
+                for row in conn.execute(SQL_WORDS_FOR_LEMMAS, (json.dumps(lemmas),)):
+                    word_row = dict(row)
+                    word_rows.setdefault(word_row.pop("wanted"), word_row)
+
+                resolved = []
+                for i, word_data in enumerate(words_data):
+                    lemma = word_data.get("lemma")
+                    word_row = None if i in rejected else word_rows.get(lemma)
+                    if word_row is None:
+                        # Counted as invalid, otherwise the word vanishes from
+                        # every counter shown to the user
+                        invalid.append(str(lemma))
+                    else:
+                        resolved.append((lemma, word_row))
 
-                        # Check if user already has this word
-                        cursor = conn.execute(
-                            "SELECT 1 FROM learning_progress WHERE telegram_id = ? AND word_id = ?",
-                            (telegram_id, word_id),
+                cursor = conn.execute(
+                    SQL_INSERT_NEW_PROGRESS,
+                    (
+                        telegram_id,
+                        json.dumps([word_row["id"] for _, word_row in resolved]),
+                    ),
+                )
+                inserted = {row[0] for row in cursor}
+
+                for lemma, word_row in resolved:
+                    if word_row["id"] not in inserted:
+                        duplicates.append(str(lemma))
+                        logger.debug(
+                            "Skipped '%s': already in learning progress of user %s",
+                            lemma,
+                            telegram_id,
                         )
-
-                        existing_progress = cursor.fetchone()
-                        if not existing_progress:
-                            # Add to user's learning progress
-                            logger.debug(
-                                f"Adding '{lemma}' to learning progress for user {telegram_id}"
-                            )
-                            cursor = conn.execute(
-                                """
-                                INSERT INTO learning_progress (telegram_id, word_id, repetitions, easiness_factor, interval_days, next_review_date)
-                                VALUES (?, ?, 0, 2.5, 1, datetime('now'))
-                                """,
-                                (telegram_id, word_id),
-                            )
-                            added.append(str(lemma))
-                            logger.info(
-                                f"SUCCESS: Added '{lemma}' to user {telegram_id}'s learning progress"
-                            )
-                        else:
-                            duplicates.append(str(lemma))
-                            logger.warning(
-                                f"SKIP REASON 2: Word '{lemma}' already exists in learning progress for user {telegram_id}"
-                            )
-
-                    except Exception as e:
-                        logger.error(
-                            f"Error adding word {word_data.get('lemma', 'unknown')}: {e}"
+                    else:
+                        # Only the first lemma resolving to a word counts as
+                        # added; later case variants of it are duplicates
+                        inserted.discard(word_row["id"])
+                        added.append(str(lemma))
+                        added_rows.append(word_row)
+                        logger.debug(
+                            "Added '%s' to learning progress of user %s",
+                            lemma,
+                            telegram_id,
                         )
-                        # Counted as invalid, otherwise the word vanishes from
-                        # every counter shown to the user
-                        invalid.append(str(word_data.get("lemma")))
-                        continue
 
                 conn.commit()
 
         except Exception as e:
             logger.error(f"Error adding words to user: {e}")
+            # Nothing was committed, so nothing was added
+            invalid = [str(word_data.get("lemma")) for word_data in words_data]
+            added, added_rows, duplicates = [], [], []
 
         logger.info(
-            f"FINAL RESULT: Successfully added {len(added)} out of {len(words_data)} words to user {telegram_id}"
+            "Added %d of %d words to user %s (%d duplicates, %d invalid)",
+            len(added),
+            len(words_data),
+            telegram_id,
+            len(duplicates),
+            len(invalid),
         )
-        if len(added) < len(words_data):
-            logger.warning(
-                f"SUMMARY: {len(duplicates)} duplicates, {len(invalid)} invalid "
-                f"words were skipped during addition process"
-            )
 
-        return {"added": added, "duplicates": duplicates, "invalid": invalid}
+        return (
+            {"added": added, "duplicates": duplicates, "invalid": invalid},
+            added_rows,
+        )
+
+    def _word_insert_params(self, word_data: dict[str, Any]) -> tuple[Any, ...]:
+        """Parameters for SQL_INSERT_MISSING_WORD, defaults filled in"""
+        return (
+            word_data.get("lemma"),
+            word_data.get("part_of_speech", "unknown"),
+            word_data.get("article"),
+            word_data.get("translation", ""),
+            word_data.get("example", ""),
+            word_data.get("additional_forms"),
+            word_data.get("confidence", 1.0),
+            word_data.get("level"),
+            word_data.get("lemma"),
+        )
 
     def _is_valid_translation(self, translation: str) -> bool:
         """Check if translation is valid and usable"""
         if not translation or translation.strip() == "":
             return False
 
-        invalid_patterns = [
-            "[translation unavailable]",
-            "translation unavailable",
-            "[unavailable]",
-            "unavailable",
-            "[error]",
-            "error",
-            "[failed]",
-            "failed",
-        ]
-
-        translation_lower = translation.lower().strip()
-        return not any(pattern in translation_lower for pattern in invalid_patterns)
+        return _INVALID_TRANSLATION.search(translation) is None
 
     def get_existing_words_details(
         self, telegram_id: int, lemmas: list[str]
@@ -802,26 +1053,19 @@ class WordRepository:
             return []
 
         try:
-            with self.db_connection.get_connection() as conn:
-                # Use multiple separate queries to avoid dynamic SQL construction
-                results = []
-                for lemma in lemmas:
-                    cursor = conn.execute(
-                        """
-                        SELECT w.lemma, w.part_of_speech, w.article, w.translation, w.example, w.additional_forms
-                        FROM words w
-                        JOIN learning_progress lp ON w.id = lp.word_id
-                        WHERE lp.telegram_id = ? AND LOWER(w.lemma) = LOWER(?)
-                        """,
-                        (telegram_id, lemma),
-                    )
+            with self.db_connection.get_reader() as conn:
+                cursor = conn.execute(
+                    SQL_EXISTING_WORDS_DETAILS, (json.dumps(lemmas), telegram_id)
+                )
 
-                    row = cursor.fetchone()
-                    if row:
-                        results.append(dict(row))
+                # One row per requested lemma, as a lookup per lemma would give
+                results: dict[int, dict[str, Any]] = {}
+                for row in cursor:
+                    details = dict(row)
+                    results.setdefault(details.pop("position"), details)
 
                 # Sort by lemma to maintain consistent ordering
-                return sorted(results, key=lambda x: x["lemma"])
+                return sorted(results.values(), key=lambda x: x["lemma"])
 
         except Exception as e:
             logger.error(f"Error getting existing words details: {e}")
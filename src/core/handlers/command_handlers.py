@@ -2,15 +2,16 @@
 Command handlers for the German Learning Bot
 """
 
+import asyncio
 import logging
 
-from telegram import ReplyKeyboardRemove, Update
+from telegram import Update
 from telegram.ext import ContextTypes
 
 from ...database import DatabaseManager
 from ...spaced_repetition import SpacedRepetitionSystem
 from ...text_parser import GermanTextParser
-from ...utils import format_progress_stats, format_topic_stats
+from ...utils import REMOVE_KEYBOARD, format_progress_stats, format_topic_stats
 from ...word_processor import WordProcessor
 
 logger = logging.getLogger(__name__)
@@ -175,6 +176,15 @@ class CommandHandlers:
         self.state_manager = state_manager
         self.session_manager = session_manager
 
+    async def _db(self, method, *args, **kwargs):
+        """Run a blocking database call off the event loop.
+
+        sqlite3 releases the GIL while it works, so a query on a worker thread
+        lets the loop keep serving other users' updates; each worker thread
+        gets its own connection from DatabaseConnection.
+        """
+        return await asyncio.to_thread(method, *args, **kwargs)
+
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         if not update.effective_user:
@@ -183,9 +193,10 @@ class CommandHandlers:
         user = update.effective_user
 
         # Create or get user
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
-            db_user = self.db_manager.create_user(
+            db_user = await self._db(
+                self.db_manager.create_user,
                 telegram_id=user.id,
                 first_name=user.first_name,
                 last_name=user.last_name,
@@ -214,7 +225,7 @@ class CommandHandlers:
             update,
             welcome_message,
             parse_mode="HTML",
-            reply_markup=ReplyKeyboardRemove(),
+            reply_markup=REMOVE_KEYBOARD,
         )
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -290,7 +301,7 @@ class CommandHandlers:
 ❓ Вопросы? Просто напишите /help"""
 
         await self._safe_reply(
-            update, help_message, parse_mode="HTML", reply_markup=ReplyKeyboardRemove()
+            update, help_message, parse_mode="HTML", reply_markup=REMOVE_KEYBOARD
         )
 
     async def add_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -302,36 +313,17 @@ class CommandHandlers:
 
         # Check for existing study session and interrupt it
         if self.session_manager:
-            existing_session = self.session_manager.get_session(telegram_id)
+            existing_session = self.session_manager.end_session(telegram_id)
             if existing_session:
-                # Calculate partial statistics for the interrupted session
-                accuracy = (
-                    (
-                        existing_session.correct_answers
-                        / existing_session.total_answers
-                        * 100
-                    )
-                    if existing_session.total_answers > 0
-                    else 0
-                )
-
                 # Notify user about interrupted session
-                interrupt_message = f"""⚠️ <b>Сессия изучения прервана</b>
-
-📊 <b>Частичные результаты:</b>
-• Слов изучено: <b>{existing_session.current_word_index}/{len(existing_session.words)}</b>
-• Хорошо/легко вспомнил (➕✅): <b>{existing_session.correct_answers}/{existing_session.total_answers}</b>
-• Точность: <b>{accuracy:.1f}%</b>
-
-📝 Переходим к добавлению новых слов..."""
+                interrupt_message = (
+                    "⚠️ <b>Сессия изучения прервана</b>\n\n"
+                    f"{existing_session.format_partial_results()}\n\n"
+                    "📝 Переходим к добавлению новых слов..."
+                )
 
                 await self._safe_reply(update, interrupt_message, parse_mode="HTML")
 
-                # Clean up the interrupted session
-                existing_session.timer.stop()
-                if telegram_id in self.session_manager.user_sessions:
-                    del self.session_manager.user_sessions[telegram_id]
-
         # Import here to avoid circular imports
         from ..state.user_state_manager import UserState
 
@@ -349,7 +341,7 @@ class CommandHandlers:
                 "📝 Отправьте мне немецкий текст для анализа.\n\n"
                 "Например: Das Wetter ist heute sehr schön.\n\n"
                 "🕒 У вас есть 10 минут для отправки текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
         else:
             # Fallback if state manager not available
@@ -357,7 +349,7 @@ class CommandHandlers:
                 update,
                 "📝 Пожалуйста, укажите немецкий текст для анализа.\n\n"
                 "Пример: /add Das Wetter ist heute sehr schön.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
 
     async def study_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -368,24 +360,26 @@ class CommandHandlers:
         user = update.effective_user
 
         # Get user from database
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
         # Get due words
-        due_words = self.db_manager.get_due_words(db_user["telegram_id"], limit=10)
+        due_words = await self._db(
+            self.db_manager.get_due_words, db_user["telegram_id"], limit=10
+        )
 
         if not due_words:
             await self._safe_reply(
                 update,
                 "🎉 Отлично! У вас нет слов для повторения сейчас.\n\n"
                 "Используйте /study_new для изучения новых слов или /add для добавления новых.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -401,23 +395,25 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        new_words = self.db_manager.get_new_words(db_user["telegram_id"], limit=10)
+        new_words = await self._db(
+            self.db_manager.get_new_words, db_user["telegram_id"], limit=10
+        )
 
         if not new_words:
             await self._safe_reply(
                 update,
                 "📚 У вас нет новых слов для изучения.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -432,17 +428,17 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        difficult_words = self.db_manager.get_difficult_words(
-            db_user["telegram_id"], limit=10
+        difficult_words = await self._db(
+            self.db_manager.get_difficult_words, db_user["telegram_id"], limit=10
         )
 
         if not difficult_words:
@@ -450,7 +446,7 @@ class CommandHandlers:
                 update,
                 "🎯 У вас нет сложных слов для повторения!\n\n"
                 "Используйте /study для обычного повторения.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -465,23 +461,25 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        verb_words = self.db_manager.get_verb_words(db_user["telegram_id"], limit=10)
+        verb_words = await self._db(
+            self.db_manager.get_verb_words, db_user["telegram_id"], limit=10
+        )
 
         if not verb_words:
             await self._safe_reply(
                 update,
                 "🔤 У вас нет глаголов для изучения.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -496,23 +494,25 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        words = self.db_manager.get_reflexive_verbs(db_user["telegram_id"], limit=10)
+        words = await self._db(
+            self.db_manager.get_reflexive_verbs, db_user["telegram_id"], limit=10
+        )
 
         if not words:
             await self._safe_reply(
                 update,
                 "🪞 У вас нет возвратных глаголов для изучения.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -527,23 +527,25 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        words = self.db_manager.get_preposition_verbs(db_user["telegram_id"], limit=10)
+        words = await self._db(
+            self.db_manager.get_preposition_verbs, db_user["telegram_id"], limit=10
+        )
 
         if not words:
             await self._safe_reply(
                 update,
                 "🧭 У вас нет глаголов с предлогами для изучения.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -558,17 +560,20 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        words = self.db_manager.get_words_by_part_of_speech(
-            db_user["telegram_id"], "route phrase", limit=10
+        words = await self._db(
+            self.db_manager.get_words_by_part_of_speech,
+            db_user["telegram_id"],
+            "route phrase",
+            limit=10,
         )
 
         if not words:
@@ -576,7 +581,7 @@ class CommandHandlers:
                 update,
                 "🗺 У вас нет фраз для описания маршрута.\n\n"
                 "Их можно загрузить набором: make seed-words TELEGRAM_ID=<ваш id>",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -591,22 +596,20 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
         getter = getattr(self.db_manager, getter_name)
-        words = getter(db_user["telegram_id"], limit=10)
+        words = await self._db(getter, db_user["telegram_id"], limit=10)
 
         if not words:
-            await self._safe_reply(
-                update, empty_message, reply_markup=ReplyKeyboardRemove()
-            )
+            await self._safe_reply(update, empty_message, reply_markup=REMOVE_KEYBOARD)
             return
 
         await self._start_study_session(update, words, session_kind)
@@ -800,23 +803,25 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        words = self.db_manager.get_cloze_words(db_user["telegram_id"], limit=10)
+        words = await self._db(
+            self.db_manager.get_cloze_words, db_user["telegram_id"], limit=10
+        )
 
         if not words:
             await self._safe_reply(
                 update,
                 "✍️ У вас нет упражнений с пропусками.\n\n"
                 "Их можно загрузить набором: make seed-words TELEGRAM_ID=<ваш id>",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -831,12 +836,12 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -845,29 +850,33 @@ class CommandHandlers:
         if not context.args:
             await self._safe_reply(
                 update,
-                self._topic_hint(
+                await self._topic_hint(
                     telegram_id, "❓ Укажите тему, например: /study_topic route-case"
                 ),
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
         topic = context.args[0]
-        words = self.db_manager.get_words_by_topic(telegram_id, topic, limit=10)
+        words = await self._db(
+            self.db_manager.get_words_by_topic, telegram_id, topic, limit=10
+        )
 
         if not words:
             await self._safe_reply(
                 update,
-                self._topic_hint(telegram_id, f"📚 Нет карточек по теме «{topic}»."),
-                reply_markup=ReplyKeyboardRemove(),
+                await self._topic_hint(
+                    telegram_id, f"📚 Нет карточек по теме «{topic}»."
+                ),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
         await self._start_study_session(update, words, f"topic:{topic}")
 
-    def _topic_hint(self, telegram_id: int, headline: str) -> str:
+    async def _topic_hint(self, telegram_id: int, headline: str) -> str:
         """Build a message listing the topic slugs the user actually has"""
-        slugs = self.db_manager.get_topic_slugs(telegram_id)
+        slugs = await self._db(self.db_manager.get_topic_slugs, telegram_id)
         if not slugs:
             return (
                 f"{headline}\n\n"
@@ -887,21 +896,21 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        rows = self.db_manager.get_topic_stats(db_user["telegram_id"])
+        rows = await self._db(self.db_manager.get_topic_stats, db_user["telegram_id"])
 
         await self._safe_reply(
             update,
             format_topic_stats(rows),
-            reply_markup=ReplyKeyboardRemove(),
+            reply_markup=REMOVE_KEYBOARD,
         )
 
     async def study_recent_command(
@@ -913,12 +922,12 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -930,13 +939,13 @@ class CommandHandlers:
                 await self._safe_reply(
                     update,
                     "❌ Укажите число слов, например: /study_recent 20",
-                    reply_markup=ReplyKeyboardRemove(),
+                    reply_markup=REMOVE_KEYBOARD,
                 )
                 return
         limit = max(1, min(limit, 200))
 
-        recent_words = self.db_manager.get_recent_words(
-            db_user["telegram_id"], limit=limit
+        recent_words = await self._db(
+            self.db_manager.get_recent_words, db_user["telegram_id"], limit=limit
         )
 
         if not recent_words:
@@ -944,7 +953,7 @@ class CommandHandlers:
                 update,
                 "📚 У вас пока нет добавленных слов.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -959,17 +968,20 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        pos_words = self.db_manager.get_words_by_part_of_speech(
-            db_user["telegram_id"], part_of_speech, limit=10
+        pos_words = await self._db(
+            self.db_manager.get_words_by_part_of_speech,
+            db_user["telegram_id"],
+            part_of_speech,
+            limit=10,
         )
 
         if not pos_words:
@@ -977,7 +989,7 @@ class CommandHandlers:
                 update,
                 f"📚 У вас нет слов с частью речи «{part_of_speech}».\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -1040,17 +1052,17 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        level_words = self.db_manager.get_words_by_level(
-            db_user["telegram_id"], level, limit=10
+        level_words = await self._db(
+            self.db_manager.get_words_by_level, db_user["telegram_id"], level, limit=10
         )
 
         if not level_words:
@@ -1059,7 +1071,7 @@ class CommandHandlers:
                 f"📚 У вас нет слов уровня «{level}».\n\n"
                 "Слова получают уровень при добавлении через /add — "
                 "старые слова, добавленные раньше, могут быть без уровня.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -1111,17 +1123,20 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        common_verb_words = self.db_manager.get_words_by_lemma_set(
-            db_user["telegram_id"], COMMON_VERBS, limit=10
+        common_verb_words = await self._db(
+            self.db_manager.get_words_by_lemma_set,
+            db_user["telegram_id"],
+            COMMON_VERBS,
+            limit=10,
         )
 
         if not common_verb_words:
@@ -1129,7 +1144,7 @@ class CommandHandlers:
                 update,
                 "📚 Среди ваших слов нет популярных глаголов из списка.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -1145,17 +1160,20 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        question_words = self.db_manager.get_words_by_lemma_set(
-            db_user["telegram_id"], QUESTION_WORDS, limit=10
+        question_words = await self._db(
+            self.db_manager.get_words_by_lemma_set,
+            db_user["telegram_id"],
+            QUESTION_WORDS,
+            limit=10,
         )
 
         if not question_words:
@@ -1163,7 +1181,7 @@ class CommandHandlers:
                 update,
                 "📚 Среди ваших слов нет вопросительных слов из списка.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -1178,17 +1196,20 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        modal_verb_words = self.db_manager.get_words_by_lemma_set(
-            db_user["telegram_id"], MODAL_VERBS, limit=10
+        modal_verb_words = await self._db(
+            self.db_manager.get_words_by_lemma_set,
+            db_user["telegram_id"],
+            MODAL_VERBS,
+            limit=10,
         )
 
         if not modal_verb_words:
@@ -1196,7 +1217,7 @@ class CommandHandlers:
                 update,
                 "📚 Среди ваших слов нет модальных глаголов из списка.\n\n"
                 "Используйте /add для добавления новых слов из текста.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
@@ -1209,21 +1230,19 @@ class CommandHandlers:
 
         user = update.effective_user
 
-        db_user = self.db_manager.get_user_by_telegram_id(user.id)
+        db_user = await self._db(self.db_manager.get_user_by_telegram_id, user.id)
         if not db_user:
             await self._safe_reply(
                 update,
                 "❌ Пользователь не найден. Используйте /start для регистрации.",
-                reply_markup=ReplyKeyboardRemove(),
+                reply_markup=REMOVE_KEYBOARD,
             )
             return
 
-        stats = self.db_manager.get_user_stats(db_user["telegram_id"])
+        stats = await self._db(self.db_manager.get_user_stats, db_user["telegram_id"])
         stats_message = format_progress_stats(stats)
 
-        await self._safe_reply(
-            update, stats_message, reply_markup=ReplyKeyboardRemove()
-        )
+        await self._safe_reply(update, stats_message, reply_markup=REMOVE_KEYBOARD)
 
     async def settings_command(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
@@ -1240,5 +1259,5 @@ class CommandHandlers:
             "• Время ежедневных напоминаний\n"
             "• Часовой пояс\n"
             "• Сложность изучения",
-            reply_markup=ReplyKeyboardRemove(),
+            reply_markup=REMOVE_KEYBOARD,
         )
@@ -4,9 +4,11 @@ Message handlers for the German Learning Bot
 
 import logging
 
-from telegram import ReplyKeyboardRemove, Update
+from telegram import Update
 from telegram.ext import ContextTypes
 
+from ...utils import REMOVE_KEYBOARD
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,44 +31,29 @@ class MessageHandlers:
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages (auto-add words)"""
-        if not update.message or not update.effective_user:
+        message = update.message
+        user = update.effective_user
+        if not message or not user:
             return
 
-        text = update.message.text
-        telegram_id = update.effective_user.id
+        text = message.text or ""
+        telegram_id = user.id
+        text_length = len(text.strip())
+        session_manager = self.session_manager
 
         # Check for existing study session and interrupt it when processing text
         interrupted_session = False
-        if self.session_manager and text and len(text.strip()) >= 3:
-            existing_session = self.session_manager.get_session(telegram_id)
+        if session_manager and text_length >= 3:
+            existing_session = session_manager.end_session(telegram_id)
             if existing_session:
-                # Calculate partial statistics for the interrupted session
-                accuracy = (
-                    (
-                        existing_session.correct_answers
-                        / existing_session.total_answers
-                        * 100
-                    )
-                    if existing_session.total_answers > 0
-                    else 0
-                )
-
                 # Notify user about interrupted session
-                interrupt_message = f"""⚠️ <b>Сессия изучения прервана</b>
-
-📊 <b>Частичные результаты:</b>
-• Слов изучено: <b>{existing_session.current_word_index}/{len(existing_session.words)}</b>
-• Хорошо/легко вспомнил (➕✅): <b>{existing_session.correct_answers}/{existing_session.total_answers}</b>
-• Точность: <b>{accuracy:.1f}%</b>
-
-📝 Переходим к добавлению новых слов..."""
+                interrupt_message = (
+                    "⚠️ <b>Сессия изучения прервана</b>\n\n"
+                    f"{existing_session.format_partial_results()}\n\n"
+                    "📝 Переходим к добавлению новых слов..."
+                )
 
                 await self._safe_reply(update, interrupt_message, parse_mode="HTML")
-
-                # Clean up the interrupted session
-                existing_session.timer.stop()
-                if telegram_id in self.session_manager.user_sessions:
-                    del self.session_manager.user_sessions[telegram_id]
                 interrupted_session = True
 
         # Check if user is waiting for text to add
@@ -75,12 +62,12 @@ class MessageHandlers:
             self.state_manager.clear_state(telegram_id)
 
             # Validate text length
-            if not text or len(text.strip()) < 3:
+            if text_length < 3:
                 await self._safe_reply(
                     update,
                     "❌ Текст слишком короткий для анализа.\n\n"
                     "Отправьте более длинный немецкий текст или используйте /add снова.",
-                    reply_markup=ReplyKeyboardRemove(),
+                    reply_markup=REMOVE_KEYBOARD,
                 )
                 return
 
@@ -89,7 +76,7 @@ class MessageHandlers:
             return
 
         # Normal message handling (auto-add mode)
-        if not text or len(text.strip()) < 10:
+        if text_length < 10:
             # Don't show help message if we just interrupted a session
             if not interrupted_session:
                 await self._safe_reply(
@@ -99,7 +86,7 @@ class MessageHandlers:
                     "/add - Добавить слова (пошагово)\n"
                     "/study - Начать изучение\n"
                     "/help - Справка",
-                    reply_markup=ReplyKeyboardRemove(),
+                    reply_markup=REMOVE_KEYBOARD,
                 )
             return
 
@@ -116,9 +103,10 @@ class MessageHandlers:
         await query.answer()
 
         # Handle study session callbacks (JSON format)
-        if query.data and query.data.startswith("{"):
+        data = query.data
+        if data and data[0] == "{":
             await self._handle_study_callback(query)
             return
 
         # Handle other callbacks as needed
-        logger.warning(f"Unhandled callback query: {query.data}")
+        logger.warning("Unhandled callback query: %s", data)
@@ -1,5 +1,6 @@
 """Lock management module for rate limiting"""
 
+from .telegram_rate_limiter import TelegramRateLimiter
 from .user_lock_manager import UserLockManager
 
-__all__ = ["UserLockManager"]
+__all__ = ["TelegramRateLimiter", "UserLockManager"]
@@ -0,0 +1,122 @@
+"""Outgoing request throttling for the Telegram Bot API"""
+
+import asyncio
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket: up to `rate` acquisitions per `period` seconds.
+
+    Waiters queue on a lock and are released in arrival order as tokens
+    refill, so a burst is spread out instead of rejected.
+    """
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated_at is not None:
+                refill = (now - self._updated_at) * self.rate / self.period
+                self._tokens = min(float(self.rate), self._tokens + refill)
+            self._updated_at = now
+
+            if self._tokens < 1:
+                wait = (1 - self._tokens) * self.period / self.rate
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated_at = loop.time()
+
+            self._tokens -= 1
+
+
+class TelegramRateLimiter(BaseRateLimiter[None]):
+    """Keeps the bot under Telegram's flood limits.
+
+    Every request shares a bot-wide bucket (about 30 messages per second);
+    requests to group chats also take a token from that chat's bucket (20
+    per minute). Private chats have no per-chat bucket, so a study session
+    answered quickly is never slowed down. A RetryAfter from Telegram is
+    honoured by waiting and retrying up to max_retries times.
+    """
+
+    def __init__(
+        self,
+        overall_rate: int = 30,
+        overall_period: float = 1.0,
+        group_rate: int = 20,
+        group_period: float = 60.0,
+        max_retries: int = 1,
+    ):
+        self._group_rate = group_rate
+        self._group_period = group_period
+        self._max_retries = max_retries
+        self._overall = TokenBucket(overall_rate, overall_period)
+        self._groups: dict[int | str, TokenBucket] = {}
+
+    async def initialize(self) -> None:
+        """Nothing to set up; buckets are created lazily"""
+
+    async def shutdown(self) -> None:
+        """Drop the per-group buckets"""
+        self._groups.clear()
+
+    @staticmethod
+    def _is_group(chat_id: Any) -> bool:
+        # Group and channel ids are negative; channels may also be @usernames
+        if isinstance(chat_id, str):
+            return chat_id.startswith("@") or chat_id.startswith("-")
+        return isinstance(chat_id, int) and chat_id < 0
+
+    async def process_request(
+        self,
+        callback: Callable[
+            ..., Coroutine[Any, Any, bool | dict[str, Any] | list[dict[str, Any]]]
+        ],
+        args: Any,
+        kwargs: dict[str, Any],
+        endpoint: str,
+        data: dict[str, Any],
+        rate_limit_args: None,
+    ) -> bool | dict[str, Any] | list[dict[str, Any]]:
+        """Wait for the relevant buckets, then make the request"""
+        chat_id = data.get("chat_id")
+        group = None
+        if self._is_group(chat_id):
+            group = self._groups.get(chat_id)
+            if group is None:
+                group = TokenBucket(self._group_rate, self._group_period)
+                self._groups[chat_id] = group
+
+        retries = 0
+        while True:
+            if group is not None:
+                await group.acquire()
+            await self._overall.acquire()
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if retries >= self._max_retries:
+                    raise
+                retries += 1
+                delay = e.retry_after
+                if not isinstance(delay, int | float):
+                    delay = delay.total_seconds()
+                logger.warning(
+                    "Telegram flood limit on %s, retrying in %ss", endpoint, delay
+                )
+                await asyncio.sleep(delay)
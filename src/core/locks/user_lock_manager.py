@@ -3,13 +3,15 @@
 import asyncio
 import contextlib
 import logging
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class LockInfo:
     """Information about a user lock"""
 
@@ -31,6 +33,8 @@ class UserLockManager:
         self._locks: dict[int, LockInfo] = {}
         self._lock_timeout = timedelta(minutes=lock_timeout_minutes)
         self._cleanup_task: asyncio.Task | None = None
+        # Makes lock ids unique without relying on clock resolution
+        self._next_lock_seq = 0
 
     async def start(self):
         """Start the lock manager and cleanup task"""
@@ -56,8 +60,7 @@ class UserLockManager:
         Returns:
             True if user is locked, False otherwise
         """
-        self._cleanup_expired_locks()
-        return user_id in self._locks
+        return self._get_live_lock(user_id) is not None
 
     def get_lock_info(self, user_id: int) -> LockInfo | None:
         """
@@ -69,8 +72,7 @@ class UserLockManager:
         Returns:
             LockInfo if user is locked, None otherwise
         """
-        self._cleanup_expired_locks()
-        return self._locks.get(user_id)
+        return self._get_live_lock(user_id)
 
     def acquire_lock(self, user_id: int, operation: str) -> bool:
         """
@@ -83,18 +85,18 @@ class UserLockManager:
         Returns:
             True if lock acquired, False if user already locked
         """
-        self._cleanup_expired_locks()
-
-        if user_id in self._locks:
+        current_lock = self._get_live_lock(user_id)
+        if current_lock:
             logger.warning(
-                f"User {user_id} already locked for operation: {self._locks[user_id].operation}"
+                f"User {user_id} already locked for operation: {current_lock.operation}"
             )
             return False
 
+        self._next_lock_seq += 1
         lock_info = LockInfo(
             locked_at=datetime.now(),
             operation=operation,
-            lock_id=f"{user_id}_{operation}_{datetime.now().timestamp()}",
+            lock_id=f"{user_id}_{operation}_{self._next_lock_seq}",
         )
 
         self._locks[user_id] = lock_info
@@ -145,31 +147,56 @@ class UserLockManager:
         self._cleanup_expired_locks()
         return len(self._locks)
 
-    def get_all_locked_users(self) -> dict[int, LockInfo]:
-        """Get all currently locked users"""
-        self._cleanup_expired_locks()
-        return self._locks.copy()
+    def get_all_locked_users(self) -> Mapping[int, LockInfo]:
+        """Get all currently locked users.
 
-    def _cleanup_expired_locks(self):
-        """Remove expired locks"""
-        current_time = datetime.now()
-        expired_users = []
+        Returns a read-only live view rather than a copy: nothing is
+        allocated per entry, and the view follows later acquires, releases
+        and sweeps because the lock dict is only ever mutated in place.
+        """
+        self._cleanup_expired_locks()
+        return MappingProxyType(self._locks)
 
-        for user_id, lock_info in self._locks.items():
-            if current_time - lock_info.locked_at > self._lock_timeout:
-                expired_users.append(user_id)
+    def _get_live_lock(self, user_id: int) -> LockInfo | None:
+        """Return the user's lock, dropping it first if it has expired.
 
-        for user_id in expired_users:
-            lock_info = self._locks.pop(user_id)
+        Only the one entry is checked, so per-user calls stay O(1) however
+        many locks are held; the periodic sweep catches locks nobody asks
+        about again.
+        """
+        lock_info = self._locks.get(user_id)
+        if lock_info and lock_info.locked_at < datetime.now() - self._lock_timeout:
+            del self._locks[user_id]
             logger.warning(
                 f"Expired lock removed for user {user_id}, operation: {lock_info.operation}"
             )
+            return None
+        return lock_info
+
+    def _cleanup_expired_locks(self):
+        """Remove expired locks"""
+        cutoff = datetime.now() - self._lock_timeout
+        expired_users = [
+            user_id
+            for user_id, lock_info in self._locks.items()
+            if lock_info.locked_at < cutoff
+        ]
+        if not expired_users:
+            return
+
+        # Deleted in place: the dict is never replaced, so views handed out
+        # by get_all_locked_users stay current
+        for user_id in expired_users:
+            del self._locks[user_id]
+        logger.warning(f"Expired locks removed for users: {sorted(expired_users)}")
 
     async def _periodic_cleanup(self):
-        """Periodic cleanup task that runs every minute"""
+        """Periodic cleanup task for locks that are never looked up again"""
         while True:
             try:
-                await asyncio.sleep(60)  # Run every minute
+                # Per-user lookups expire their own lock, so this sweep only
+                # bounds memory for abandoned ones
+                await asyncio.sleep(600)
                 self._cleanup_expired_locks()
             except asyncio.CancelledError:
                 break
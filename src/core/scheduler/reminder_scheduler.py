@@ -6,11 +6,13 @@ import asyncio
 import contextlib
 import logging
 from collections.abc import Callable
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
+_ONE_DAY = timedelta(days=1)
+
 
 class ReminderScheduler:
     """Scheduler for daily study reminders"""
@@ -56,14 +58,17 @@ class ReminderScheduler:
 
     async def _schedule_loop(self):
         """Main scheduling loop"""
+        next_reminder = None
         while self.is_running:
             try:
-                # Calculate next reminder time
-                next_reminder = self._get_next_reminder_time()
-                now = datetime.now(self.timezone)
+                if next_reminder is None:
+                    next_reminder = self._get_next_reminder_time()
 
-                # Calculate sleep duration
-                sleep_duration = (next_reminder - now).total_seconds()
+                # Via timestamps: subtracting two datetimes in the same zone
+                # ignores a DST change between them and would fire an hour off
+                sleep_duration = (
+                    next_reminder.timestamp() - datetime.now(self.timezone).timestamp()
+                )
 
                 if sleep_duration > 0:
                     logger.info(
@@ -75,12 +80,25 @@ class ReminderScheduler:
                 if self.is_running:
                     await self._send_daily_reminders()
 
+                # Advance from the fire time rather than recomputing from
+                # "now": a sleep that wakes a hair early cannot send twice.
+                # Aware datetime addition keeps the local wall-clock time
+                next_reminder += _ONE_DAY
+                if next_reminder.timestamp() <= datetime.now(self.timezone).timestamp():
+                    # Woke more than a day late (host suspended): skip to the
+                    # next upcoming reminder instead of one per missed day
+                    next_reminder = self._get_next_reminder_time()
+                continue
+
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in reminder scheduler: {e}")
-                # Sleep for a minute before retrying
-                await asyncio.sleep(60)
+                next_reminder = None
+
+            # Sleep for a minute before retrying. Kept outside the handler so
+            # the exception and its traceback frames are not held meanwhile
+            await asyncio.sleep(60)
 
     def _get_next_reminder_time(self) -> datetime:
         """Get the next reminder time"""
@@ -89,14 +107,11 @@ class ReminderScheduler:
             now.date(), self.reminder_time, tzinfo=self.timezone
         )
 
-        # If today's reminder time has passed, schedule for tomorrow
+        # If today's reminder time has passed, schedule for tomorrow; aware
+        # addition keeps the same wall-clock time across a DST change
         if now >= today_reminder:
-            from datetime import timedelta
-
-            tomorrow = now.date() + timedelta(days=1)
-            return datetime.combine(tomorrow, self.reminder_time, tzinfo=self.timezone)
-        else:
-            return today_reminder
+            return today_reminder + _ONE_DAY
+        return today_reminder
 
     async def _send_daily_reminders(self):
         """Send daily reminders to all users"""
@@ -2,19 +2,20 @@
 Session management for the German Learning Bot
 """
 
+import asyncio
 import logging
-from datetime import datetime
+import time
 
 from telegram import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    ReplyKeyboardRemove,
     Update,
 )
 
 from ...database import DatabaseManager
 from ...spaced_repetition import SpacedRepetitionSystem
 from ...utils import (
+    REMOVE_KEYBOARD,
     Timer,
     create_inline_keyboard_data,
     format_case_line,
@@ -29,10 +30,25 @@ from ...utils import (
 
 logger = logging.getLogger(__name__)
 
+# Rating buttons differ per card only in their callback data
+_RATING_LABELS = tuple((rating, get_rating_emoji(rating)) for rating in (1, 2, 3, 4))
+
 
 class StudySession:
     """Represents a single study session"""
 
+    __slots__ = (
+        "correct_answers",
+        "created_at",
+        "current_word_index",
+        "session_id",
+        "session_type",
+        "telegram_id",
+        "timer",
+        "total_answers",
+        "words",
+    )
+
     def __init__(
         self, session_id: str, telegram_id: int, words: list[dict], session_type: str
     ):
@@ -44,7 +60,8 @@ class StudySession:
         self.correct_answers = 0
         self.total_answers = 0
         self.timer = Timer()
-        self.created_at = datetime.now()
+        # Monotonic: only ever used for age, and immune to clock changes
+        self.created_at = time.monotonic()
 
     def get_current_word(self) -> dict | None:
         """Get the current word being studied"""
@@ -66,6 +83,35 @@ class StudySession:
         if correct:
             self.correct_answers += 1
 
+    @property
+    def accuracy(self) -> float:
+        """Share of answers rated good or easy, in percent"""
+        if self.total_answers > 0:
+            return self.correct_answers / self.total_answers * 100
+        return 0.0
+
+    def format_completion(self) -> str:
+        """Summary shown when every card in the session has been rated"""
+        return (
+            "✅ <b>Сессия завершена!</b>\n\n"
+            "📊 <b>Результаты:</b>\n"
+            f"• Слов изучено: <b>{len(self.words)}</b>\n"
+            "• Хорошо/легко вспомнил (➕✅): "
+            f"<b>{self.correct_answers}/{self.total_answers}</b>\n"
+            f"• Точность: <b>{self.accuracy:.1f}%</b>\n\n"
+            "🎯 Отличная работа! Продолжайте изучение для лучшего запоминания."
+        )
+
+    def format_partial_results(self) -> str:
+        """Progress block shown when the session is cut short"""
+        return (
+            "📊 <b>Частичные результаты:</b>\n"
+            f"• Слов изучено: <b>{self.current_word_index}/{len(self.words)}</b>\n"
+            "• Хорошо/легко вспомнил (➕✅): "
+            f"<b>{self.correct_answers}/{self.total_answers}</b>\n"
+            f"• Точность: <b>{self.accuracy:.1f}%</b>"
+        )
+
 
 class SessionManager:
     """Manages user study sessions"""
@@ -82,6 +128,12 @@ class SessionManager:
         self._safe_reply = safe_reply_callback
         self._safe_edit = safe_edit_callback
         self.user_sessions: dict[int, StudySession] = {}
+        self._callback_dispatch = {
+            "show_answer": self.handle_show_answer,
+            "rate_word": self.handle_word_rating,
+            "next_card": self._handle_next_card,
+            "finish_session": self._handle_finish_session,
+        }
 
     async def start_study_session(
         self, update: Update, words: list[dict], session_type: str
@@ -89,34 +141,18 @@ class SessionManager:
         """Start a new study session"""
         telegram_id = update.effective_user.id
 
-        # Check for existing session and handle interruption
-        existing_session = self.user_sessions.get(telegram_id)
+        # End any existing session before the interrupt reply is awaited
+        existing_session = self.end_session(telegram_id)
         if existing_session:
-            # Calculate partial statistics for the interrupted session
-            accuracy = (
-                (
-                    existing_session.correct_answers
-                    / existing_session.total_answers
-                    * 100
-                )
-                if existing_session.total_answers > 0
-                else 0
-            )
-
             # Notify user about interrupted session
-            interrupt_message = f"""⚠️ <b>Предыдущая сессия прервана</b>
-
-📊 <b>Частичные результаты:</b>
-• Слов изучено: <b>{existing_session.current_word_index}/{len(existing_session.words)}</b>
-• Хорошо/легко вспомнил (➕✅): <b>{existing_session.correct_answers}/{existing_session.total_answers}</b>
-• Точность: <b>{accuracy:.1f}%</b>
-
-🔄 Начинаем новую сессию изучения..."""
+            interrupt_message = (
+                "⚠️ <b>Предыдущая сессия прервана</b>\n\n"
+                f"{existing_session.format_partial_results()}\n\n"
+                "🔄 Начинаем новую сессию изучения..."
+            )
 
             await self._safe_reply(update, interrupt_message, parse_mode="HTML")
 
-            # Clean up the interrupted session
-            existing_session.timer.stop()
             logger.info(
                 f"Interrupted existing {existing_session.session_type} session for telegram_id {telegram_id}"
             )
@@ -128,12 +164,14 @@ class SessionManager:
 
         # Create session with compact ID
         # Use only last 6 digits of timestamp for uniqueness while staying compact
-        timestamp = int(datetime.now().timestamp())
+        timestamp = int(time.time())
         compact_timestamp = timestamp % 1000000  # Last 6 digits
         session_id = f"{telegram_id}_{compact_timestamp}"
         session = StudySession(session_id, telegram_id, words, session_type)
 
-        # Store session (replacing any existing one)
+        # Store session; one started while the reply above was awaited is
+        # superseded, and end_session stops its timer
+        self.end_session(telegram_id)
         self.user_sessions[telegram_id] = session
         session.timer.start()
 
@@ -147,12 +185,22 @@ class SessionManager:
             await self._finish_session(update, session)
             return
 
-        # Format study card
+        card_text, reply_markup = self._format_card(session, word)
+        await self._safe_reply(update, card_text, reply_markup=reply_markup)
+
+    @staticmethod
+    def _format_card(
+        session: StudySession, word: dict
+    ) -> tuple[str, InlineKeyboardMarkup]:
+        """Build the question side of a flashcard and its reveal button.
+
+        Built when the card is shown rather than for the whole session up
+        front: a session can hold 200 cards and is often left early.
+        """
         card_text = format_study_card(
             word, session.current_word_index + 1, len(session.words)
         )
 
-        # Create inline keyboard
         keyboard_data = create_inline_keyboard_data(
             action="show_answer",
             word_id=word["id"],
@@ -162,9 +210,7 @@ class SessionManager:
         keyboard = [
             [InlineKeyboardButton("🔍 Показать ответ", callback_data=keyboard_data)]
         ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
-        await self._safe_reply(update, card_text, reply_markup=reply_markup)
+        return card_text, InlineKeyboardMarkup(keyboard)
 
     @staticmethod
     def _format_answer_text(word: dict) -> str:
@@ -219,20 +265,17 @@ class SessionManager:
         answer_text = self._format_answer_text(word)
 
         # Create rating keyboard
-        rating_buttons = []
-        for rating in [1, 2, 3, 4]:
-            emoji = get_rating_emoji(rating)
-            callback_data = create_inline_keyboard_data(
-                action="rate_word",
-                word_id=word["id"],
-                rating=rating,
+        word_id = word["id"]
+        rating_buttons = [
+            InlineKeyboardButton(
+                emoji,
+                callback_data=create_inline_keyboard_data(
+                    action="rate_word", word_id=word_id, rating=rating
+                ),
             )
-            rating_buttons.append(
-                InlineKeyboardButton(emoji, callback_data=callback_data)
-            )
-
-        keyboard = [rating_buttons]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+            for rating, emoji in _RATING_LABELS
+        ]
+        reply_markup = InlineKeyboardMarkup([rating_buttons])
 
         await self._safe_edit(
             query, answer_text, reply_markup=reply_markup, parse_mode="HTML"
@@ -254,21 +297,43 @@ class SessionManager:
             logger.error("Missing word_id or rating in callback data")
             return
 
-        # Update word progress - now using telegram_id directly
+        # A second tap on an already rated card (handlers run concurrently)
+        # must not rate the next word in its place. The check and the
+        # advance below run without an await between them, so a tap that
+        # arrives while the database write is pending sees the next word.
+        current_word = session.get_current_word()
+        if not current_word or current_word["id"] != word_id:
+            logger.info(
+                "Ignoring stale rating for word %s from %s", word_id, telegram_user_id
+            )
+            return
+
+        # Record answer statistics
+        session.record_answer(rating >= 3)  # Consider 3+ as correct
+        session.advance_to_next_word()
+
+        # Update word progress - now using telegram_id directly. The write
+        # may wait on SQLite's write lock, so it runs off the event loop
         logger.info(
-            f"Updating statistics: telegram_id {telegram_user_id}, word {word_id}, rating {rating}"
+            "Updating statistics: telegram_id %s, word %s, rating %s",
+            telegram_user_id,
+            word_id,
+            rating,
+        )
+        await asyncio.to_thread(
+            self.db_manager.update_learning_progress, telegram_user_id, word_id, rating
         )
-        self.db_manager.update_learning_progress(telegram_user_id, word_id, rating)
         logger.info(
-            f"Statistics updated successfully for telegram_id {telegram_user_id}, word {word_id}"
+            "Statistics updated successfully for telegram_id %s, word %s",
+            telegram_user_id,
+            word_id,
         )
 
-        # Record answer statistics
-        session.record_answer(rating >= 3)  # Consider 3+ as correct
+        # The session may have been ended or replaced during the write
+        if self.user_sessions.get(telegram_user_id) is not session:
+            return
 
         # Show next card or finish session
-        session.advance_to_next_word()
-
         if session.is_finished():
             await self._finish_session_from_query(query, session)
         else:
@@ -280,97 +345,40 @@ class SessionManager:
         if not word:
             return
 
-        # Format next card
-        card_text = format_study_card(
-            word, session.current_word_index + 1, len(session.words)
-        )
-
-        # Create show answer button
-        keyboard_data = create_inline_keyboard_data(
-            action="show_answer",
-            word_id=word["id"],
-            word_index=session.current_word_index,
-        )
-
-        keyboard = [
-            [InlineKeyboardButton("🔍 Показать ответ", callback_data=keyboard_data)]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
+        card_text, reply_markup = self._format_card(session, word)
         await self._safe_edit(query, card_text, reply_markup=reply_markup)
 
     async def _finish_session(self, update: Update, session: StudySession):
         """Finish the study session"""
-        session.timer.stop()
+        self.end_session(session.telegram_id)
 
-        # Calculate statistics
-        accuracy = (
-            (session.correct_answers / session.total_answers * 100)
-            if session.total_answers > 0
-            else 0
-        )
-
-        completion_text = f"""✅ <b>Сессия завершена!</b>
-
-📊 <b>Результаты:</b>
-• Слов изучено: <b>{len(session.words)}</b>
-• Хорошо/легко вспомнил (➕✅): <b>{session.correct_answers}/{session.total_answers}</b>
-• Точность: <b>{accuracy:.1f}%</b>
-
-🎯 Отличная работа! Продолжайте изучение для лучшего запоминания."""
+        completion_text = session.format_completion()
 
         await self._safe_reply(
             update,
             completion_text,
             parse_mode="HTML",
-            reply_markup=ReplyKeyboardRemove(),
+            reply_markup=REMOVE_KEYBOARD,
         )
 
-        # Clean up session
-        if session.telegram_id in self.user_sessions:
-            del self.user_sessions[session.telegram_id]
-
     async def _finish_session_from_query(self, query, session: StudySession):
         """Finish the study session from a callback query"""
-        session.timer.stop()
-
-        # Calculate statistics
-        accuracy = (
-            (session.correct_answers / session.total_answers * 100)
-            if session.total_answers > 0
-            else 0
-        )
-
-        completion_text = f"""✅ <b>Сессия завершена!</b>
-
-📊 <b>Результаты:</b>
-• Слов изучено: <b>{len(session.words)}</b>
-• Хорошо/легко вспомнил (➕✅): <b>{session.correct_answers}/{session.total_answers}</b>
-• Точность: <b>{accuracy:.1f}%</b>
+        self.end_session(session.telegram_id)
 
-🎯 Отличная работа! Продолжайте изучение для лучшего запоминания."""
+        completion_text = session.format_completion()
 
         await self._safe_edit(query, completion_text, parse_mode="HTML")
 
-        # Clean up session
-        if session.telegram_id in self.user_sessions:
-            del self.user_sessions[session.telegram_id]
-
     async def handle_study_callback(self, query):
         """Handle study-related callback queries"""
         data = parse_inline_keyboard_data(query.data)
         action = data.get("action")
 
-        if action == "show_answer":
-            await self.handle_show_answer(query, data)
-        elif action == "rate_word":
-            await self.handle_word_rating(query, data)
-        elif action == "next_card":
-            await self._handle_next_card(query, data)
-        elif action == "finish_session":
-            await self._handle_finish_session(query, data)
-        else:
-            logger.warning(f"Unknown study callback action: {action}")
+        handler = self._callback_dispatch.get(action)
+        if handler is None:
+            logger.warning("Unknown study callback action: %s", action)
+            return
+        await handler(query, data)
 
     async def _handle_next_card(self, query, data: dict):
         """Handle next card button"""
@@ -398,15 +406,25 @@ class SessionManager:
         """Get active session for user"""
         return self.user_sessions.get(telegram_id)
 
+    def end_session(self, telegram_id: int) -> StudySession | None:
+        """Stop and drop the user's active session, returning it if there was one.
+
+        Callers end the session before awaiting any reply, so a session the
+        user starts meanwhile is never the one removed.
+        """
+        session = self.user_sessions.pop(telegram_id, None)
+        if session:
+            session.timer.stop()
+        return session
+
     def cleanup_expired_sessions(self, max_age_hours: int = 24):
         """Clean up expired sessions"""
-        current_time = datetime.now()
-        expired_sessions = []
-
-        for telegram_id, session in self.user_sessions.items():
-            age = (current_time - session.created_at).total_seconds() / 3600
-            if age > max_age_hours:
-                expired_sessions.append(telegram_id)
+        cutoff = time.monotonic() - max_age_hours * 3600
+        expired_sessions = [
+            telegram_id
+            for telegram_id, session in self.user_sessions.items()
+            if session.created_at < cutoff
+        ]
 
         for telegram_id in expired_sessions:
             del self.user_sessions[telegram_id]
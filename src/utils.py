@@ -11,8 +11,14 @@ from datetime import date, datetime
 from functools import wraps
 from typing import Any
 
+from telegram import ReplyKeyboardRemove
+
 logger = logging.getLogger(__name__)
 
+# PTB markup objects are frozen after construction, so every reply that
+# hides the custom keyboard can share this one instance
+REMOVE_KEYBOARD = ReplyKeyboardRemove()
+
 
 def format_word_display(word_data: dict[str, Any]) -> str:
     """Format word data for display in Telegram"""
@@ -97,3 +97,49 @@ class TestAddWordsWithDetails:
         )
 
         assert [d["lemma"] for d in details] == ["Mülltonne"]
+
+    def test_batch_resolves_case_variants_and_constraint_failures(self, db_manager):
+        """One transaction still classifies every word like the per-word path"""
+        user = db_manager.create_user(telegram_id=555, first_name="Test")
+        broken = _word("Dach")
+        broken["part_of_speech"] = None  # violates NOT NULL on insert
+
+        result = db_manager.add_words_with_details(
+            user["telegram_id"],
+            [_word("Haus"), broken, _word("haus"), _word("Ort"), _word("Ort")],
+        )
+
+        assert result["added"] == ["Haus", "Ort"]
+        assert result["duplicates"] == ["haus", "Ort"]
+        assert result["invalid"] == ["Dach"]
+        assert db_manager.get_word_by_lemma("haus") is None
+
+    def test_existing_words_details_for_many_lemmas(self, db_manager):
+        """One row per known lemma, sorted, unknown lemmas left out"""
+        user = db_manager.create_user(telegram_id=666, first_name="Test")
+        db_manager.add_words_to_user(
+            user["telegram_id"], [_word("Ort"), _word("Hof"), _word("Dach")]
+        )
+
+        details = db_manager.get_existing_words_details(
+            user["telegram_id"], ["ort", "Mülltonne", "hof", "Dach"]
+        )
+
+        assert [d["lemma"] for d in details] == ["Dach", "Hof", "Ort"]
+        assert details[0]["translation"] == "перевод"
+
+    @pytest.mark.parametrize(
+        "translation, valid",
+        [
+            ("дом", True),
+            ("  ", False),
+            ("", False),
+            ("[translation unavailable]", False),
+            ("Translation Unavailable", False),
+            ("[ERROR]", False),
+            ("request failed", False),
+            ("ошибка", True),
+        ],
+    )
+    def test_translation_placeholders_are_invalid(self, db_manager, translation, valid):
+        assert db_manager.word_repo._is_valid_translation(translation) is valid
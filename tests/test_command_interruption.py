@@ -3,6 +3,8 @@ Tests for command interruption functionality
 """
 
 import asyncio
+import threading
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
@@ -17,6 +19,7 @@ from src.core.state.user_state_manager import UserState, UserStateManager
 from src.database import DatabaseManager
 from src.spaced_repetition import SpacedRepetitionSystem
 from src.text_parser import GermanTextParser
+from src.utils import parse_inline_keyboard_data
 from src.word_processor import WordProcessor
 
 
@@ -221,6 +224,190 @@ class TestSessionManagerInterruption:
         assert new_session.session_type == "new"
         assert new_session.current_word_index == 0
 
+    @pytest.mark.asyncio
+    async def test_start_study_session_ends_old_session_before_replying(
+        self, session_manager, mock_update, mock_safe_reply
+    ):
+        """The interrupted session is gone, timer stopped, while the reply runs"""
+        words = [{"id": 1, "lemma": "Hund", "translation": "dog", "example": "x"}]
+        old = StudySession("old", 12345, words, "regular")
+        old.timer.start()
+        session_manager.user_sessions[12345] = old
+        during_reply = []
+
+        async def record_reply(*args, **kwargs):
+            if not during_reply:
+                during_reply.append(
+                    (session_manager.user_sessions.get(12345), old.timer.end_time)
+                )
+
+        mock_safe_reply.side_effect = record_reply
+
+        await session_manager.start_study_session(mock_update, words, "new")
+
+        session, old_timer_end = during_reply[0]
+        assert session is None
+        assert old_timer_end is not None
+
+    @pytest.mark.asyncio
+    async def test_session_started_during_interrupt_reply_is_stopped(
+        self, session_manager, mock_update, mock_safe_reply
+    ):
+        """A session that slips in during the reply is superseded, not leaked"""
+        words = [{"id": 1, "lemma": "Hund", "translation": "dog", "example": "x"}]
+        session_manager.user_sessions[12345] = StudySession(
+            "old", 12345, words, "regular"
+        )
+        racing = StudySession("racing", 12345, words, "regular")
+        racing.timer.start()
+
+        async def start_racing_session(*args, **kwargs):
+            session_manager.user_sessions.setdefault(12345, racing)
+
+        mock_safe_reply.side_effect = start_racing_session
+
+        await session_manager.start_study_session(mock_update, words, "new")
+
+        assert session_manager.user_sessions[12345] is not racing
+        assert racing.timer.end_time is not None
+
+    def test_partial_results_report_progress_and_accuracy(self):
+        """The interruption summary counts progress and rated answers"""
+        session = StudySession("session1", 12345, [{"id": 1}, {"id": 2}], "new")
+        session.current_word_index = 1
+        session.record_answer(True)
+        session.record_answer(False)
+
+        summary = session.format_partial_results()
+
+        assert "Слов изучено: <b>1/2</b>" in summary
+        assert "(➕✅): <b>1/2</b>" in summary
+        assert "Точность: <b>50.0%</b>" in summary
+
+    @pytest.mark.asyncio
+    async def test_second_tap_on_a_rated_card_is_ignored(
+        self, session_manager, mock_db_manager
+    ):
+        """A repeated rating press must not rate the next card"""
+        words = [{"id": 1, "lemma": "Hund"}, {"id": 2, "lemma": "Katze"}]
+        session = StudySession("session1", 12345, words, "regular")
+        session_manager.user_sessions[12345] = session
+        query = MagicMock()
+        query.from_user.id = 12345
+
+        await session_manager.handle_word_rating(query, {"word_id": 1, "rating": 3})
+        await session_manager.handle_word_rating(query, {"word_id": 1, "rating": 3})
+
+        mock_db_manager.update_learning_progress.assert_called_once_with(12345, 1, 3)
+        assert session.current_word_index == 1
+        assert session.total_answers == 1
+
+    @pytest.mark.asyncio
+    async def test_second_tap_during_the_progress_write_is_ignored(
+        self, session_manager, mock_db_manager
+    ):
+        """The write runs off the loop; a tap landing meanwhile changes nothing"""
+        words = [{"id": 1, "lemma": "Hund"}, {"id": 2, "lemma": "Katze"}]
+        session = StudySession("session1", 12345, words, "regular")
+        session_manager.user_sessions[12345] = session
+        query = MagicMock()
+        query.from_user.id = 12345
+        writing = threading.Event()
+        release = threading.Event()
+        released = []
+
+        def slow_update(*args):
+            writing.set()
+            # Times out if the write blocks the loop that would release it
+            released.append(release.wait(5))
+
+        mock_db_manager.update_learning_progress.side_effect = slow_update
+
+        first_tap = asyncio.create_task(
+            session_manager.handle_word_rating(query, {"word_id": 1, "rating": 3})
+        )
+        assert await asyncio.to_thread(writing.wait, 5)
+        await session_manager.handle_word_rating(query, {"word_id": 1, "rating": 3})
+        release.set()
+        await first_tap
+
+        assert released == [True]
+        mock_db_manager.update_learning_progress.assert_called_once_with(12345, 1, 3)
+        assert session.current_word_index == 1
+        assert session.total_answers == 1
+
+    @pytest.mark.asyncio
+    async def test_study_callback_routes_by_action(self, session_manager):
+        """Each button action reaches its handler; unknown ones are dropped"""
+        query = MagicMock()
+        query.from_user.id = 12345
+        query.edit_message_text = AsyncMock()
+
+        query.data = '{"action": "finish_session"}'
+        await session_manager.handle_study_callback(query)
+        query.edit_message_text.assert_awaited_once_with("❌ Сессия истекла")
+
+        query.edit_message_text.reset_mock()
+        query.data = '{"action": "bogus"}'
+        await session_manager.handle_study_callback(query)
+        query.edit_message_text.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_show_answer_offers_four_ratings_for_the_card(
+        self, session_manager, mock_safe_edit
+    ):
+        """The rating buttons carry the shown word and each rating"""
+        words = [
+            {
+                "id": 7,
+                "lemma": "Hund",
+                "part_of_speech": "noun",
+                "translation": "dog",
+                "example": "Der Hund bellt.",
+            }
+        ]
+        session_manager.user_sessions[12345] = StudySession(
+            "session1", 12345, words, "regular"
+        )
+        query = MagicMock()
+        query.from_user.id = 12345
+
+        await session_manager.handle_show_answer(query, {})
+
+        markup = mock_safe_edit.call_args.kwargs["reply_markup"]
+        (row,) = markup.inline_keyboard
+        assert [button.text for button in row] == ["❌", "➖", "➕", "✅"]
+        parsed = [parse_inline_keyboard_data(button.callback_data) for button in row]
+        assert [(p["word_id"], p["rating"]) for p in parsed] == [
+            (7, 1),
+            (7, 2),
+            (7, 3),
+            (7, 4),
+        ]
+
+    def test_completion_reports_words_and_accuracy(self):
+        """The end-of-session summary counts every card and rated answer"""
+        session = StudySession("session1", 12345, [{"id": 1}, {"id": 2}], "new")
+        session.record_answer(True)
+        session.record_answer(True)
+
+        summary = session.format_completion()
+
+        assert summary.startswith("✅ <b>Сессия завершена!</b>")
+        assert "Слов изучено: <b>2</b>" in summary
+        assert "Точность: <b>100.0%</b>" in summary
+
+    def test_cleanup_drops_only_sessions_past_max_age(self, session_manager):
+        """Session age is measured on the monotonic clock"""
+        stale = StudySession("stale", 1, [], "regular")
+        stale.created_at = time.monotonic() - 25 * 3600
+        fresh = StudySession("fresh", 2, [], "regular")
+        session_manager.user_sessions.update({1: stale, 2: fresh})
+
+        session_manager.cleanup_expired_sessions(max_age_hours=24)
+
+        assert session_manager.user_sessions == {2: fresh}
+
     @pytest.mark.asyncio
     async def test_start_study_session_no_interruption_when_no_existing_session(
         self, session_manager, mock_update, mock_safe_reply
@@ -436,6 +623,26 @@ class TestMessageHandlersInterruption:
         # Verify session was cleaned up
         assert 12345 not in message_handlers.session_manager.user_sessions
 
+    @pytest.mark.asyncio
+    async def test_session_started_during_interrupt_reply_survives(
+        self, message_handlers, mock_update, mock_context, mock_safe_reply
+    ):
+        """Ending the old session must not drop one started while replying"""
+        mock_update.message.text = "Das ist ein deutscher Text für den Test."
+        words = [{"id": 1, "lemma": "Hund", "translation": "dog"}]
+        sessions = message_handlers.session_manager.user_sessions
+        sessions[12345] = StudySession("old", 12345, words, "regular")
+        newer = StudySession("new", 12345, words, "new")
+
+        async def start_newer_session(*args, **kwargs):
+            sessions[12345] = newer
+
+        mock_safe_reply.side_effect = start_newer_session
+
+        await message_handlers.handle_message(mock_update, mock_context)
+
+        assert sessions.get(12345) is newer
+
     @pytest.mark.asyncio
     async def test_handle_message_no_interruption_for_short_text(
         self, message_handlers, mock_update, mock_context, mock_safe_reply
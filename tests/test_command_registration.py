@@ -198,6 +198,8 @@ async def test_startup_pushes_the_menu_to_telegram(bot_handler):
     builder.write_timeout.return_value = builder
     builder.connect_timeout.return_value = builder
     builder.pool_timeout.return_value = builder
+    builder.defaults.return_value = builder
+    builder.rate_limiter.return_value = builder
     # Accepted but never fired by PTB on this lifecycle: registering the menu
     # here instead must fail the assertion below.
     builder.post_init.return_value = builder
@@ -214,3 +216,9 @@ async def test_startup_pushes_the_menu_to_telegram(bot_handler):
     sent = {c.command for c in application.bot.set_my_commands.call_args[0][0]}
     assert "study_route" in sent
     assert "stats_topics" in sent
+
+
+def test_handlers_do_not_block_other_updates(bot_handler):
+    application = bot_handler._build_application()
+
+    assert application.bot.defaults.block is False
@@ -63,9 +63,7 @@ class TestGetAllActiveUsers:
 
         mock_conn = MagicMock()
         mock_conn.execute.return_value = mock_cursor
-        mock_db_connection.get_connection.return_value.__enter__.return_value = (
-            mock_conn
-        )
+        mock_db_connection.get_reader.return_value.__enter__.return_value = mock_conn
 
         # Test the method
         result = user_repo.get_all_active_users()
@@ -90,9 +88,7 @@ class TestGetAllActiveUsers:
 
         mock_conn = MagicMock()
         mock_conn.execute.return_value = mock_cursor
-        mock_db_connection.get_connection.return_value.__enter__.return_value = (
-            mock_conn
-        )
+        mock_db_connection.get_reader.return_value.__enter__.return_value = mock_conn
 
         # Test the method
         result = user_repo.get_all_active_users()
@@ -108,9 +104,7 @@ class TestGetAllActiveUsers:
 
         mock_conn = MagicMock()
         mock_conn.execute.return_value = mock_cursor
-        mock_db_connection.get_connection.return_value.__enter__.return_value = (
-            mock_conn
-        )
+        mock_db_connection.get_reader.return_value.__enter__.return_value = mock_conn
 
         # Test the method
         result = user_repo.get_all_active_users()
@@ -121,7 +115,7 @@ class TestGetAllActiveUsers:
     def test_get_all_active_users_database_error(self, user_repo, mock_db_connection):
         """Test handling of database errors"""
         # Mock database error
-        mock_db_connection.get_connection.side_effect = Exception(
+        mock_db_connection.get_reader.side_effect = Exception(
             "Database connection failed"
         )
 
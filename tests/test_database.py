@@ -2,12 +2,15 @@
 Unit tests for database operations
 """
 
+import itertools
 import os
+import sqlite3
 import tempfile
 from unittest.mock import patch
 
 import pytest
 
+from src.core.database.cache import RowCache
 from src.database import DatabaseManager, get_db_manager, init_db
 
 
@@ -73,6 +76,75 @@ class TestDatabaseManager:
             for table in expected_tables:
                 assert table in tables
 
+    def test_per_user_range_indexes(self, temp_db):
+        """Stats windows and due-date lookups seek by user, not scan"""
+        with temp_db.get_connection() as conn:
+            plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM review_history "
+                    "WHERE telegram_id = ? AND reviewed_at >= datetime('now', ?)",
+                    (1, "-30 days"),
+                )
+            )
+            indexes = {
+                row["name"]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+
+        assert "idx_review_history_user_reviewed_at" in plan
+        assert "idx_learning_progress_user_next_review" in indexes
+
+    def test_study_candidate_ids_read_covering_partial_indexes(self, temp_db):
+        """New and difficult picks read only their partial index"""
+        from src.core.database.repositories.word_repository import (
+            SQL_DIFFICULT_WORD_IDS,
+            SQL_NEW_WORD_IDS,
+        )
+
+        with temp_db.get_connection() as conn:
+            new_plan = " ".join(
+                row["detail"]
+                for row in conn.execute("EXPLAIN QUERY PLAN " + SQL_NEW_WORD_IDS, (1,))
+            )
+            difficult_plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN " + SQL_DIFFICULT_WORD_IDS, (1,)
+                )
+            )
+
+        assert "COVERING INDEX idx_learning_progress_new" in new_plan
+        assert "COVERING INDEX idx_learning_progress_difficult" in difficult_plan
+
+    def test_lemma_lookups_use_the_lowercase_index(self, temp_db):
+        """Case-insensitive lemma matches seek the LOWER(lemma) index"""
+        from src.core.database.repositories.word_repository import (
+            SQL_EXISTING_LEMMAS,
+            SQL_WORDS_FOR_LEMMAS,
+        )
+
+        with temp_db.get_connection() as conn:
+            plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN " + SQL_WORDS_FOR_LEMMAS, ('["haus"]',)
+                )
+            )
+            existing_plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN " + SQL_EXISTING_LEMMAS, ('["haus"]', 1)
+                )
+            )
+
+        assert "idx_words_lemma_lower" in plan
+        # The user's progress is probed by key, not scanned per user
+        assert "idx_words_lemma_lower" in existing_plan
+        assert "word_id=?" in existing_plan
+
     def test_create_user(self, temp_db, sample_user_data):
         """Test user creation"""
         user = temp_db.create_user(**sample_user_data)
@@ -84,6 +156,34 @@ class TestDatabaseManager:
         existing_user = temp_db.get_user_by_telegram_id(sample_user_data["telegram_id"])
         assert existing_user["telegram_id"] == user["telegram_id"]
 
+    def test_created_rows_match_stored_rows(self, temp_db, sample_user_data):
+        """Rows read back by INSERT ... RETURNING equal a fresh SELECT"""
+        user = temp_db.create_user(**sample_user_data)
+        word = temp_db.word_repo.create_word(
+            {
+                "lemma": "Baum",
+                "part_of_speech": "noun",
+                "translation": "дерево",
+                "example": "Der Baum.",
+            }
+        )
+
+        assert user == temp_db.get_user_by_telegram_id(user["telegram_id"])
+        assert word == temp_db.get_word_by_id(word["id"])
+        assert temp_db.create_user(**sample_user_data) is None
+
+    def test_user_writes_invalidate_cached_user(self, temp_db, sample_user_data):
+        """A cached user reflects update_user and deactivate_user at once"""
+        telegram_id = sample_user_data["telegram_id"]
+        temp_db.create_user(**sample_user_data)
+        assert temp_db.get_user_by_telegram_id(telegram_id)["first_name"] == "Test"
+
+        temp_db.user_repo.update_user(telegram_id, first_name="Renamed")
+        assert temp_db.get_user_by_telegram_id(telegram_id)["first_name"] == "Renamed"
+
+        temp_db.user_repo.deactivate_user(telegram_id)
+        assert temp_db.get_user_by_telegram_id(telegram_id)["is_active"] == 0
+
     def test_get_user_by_telegram_id(self, temp_db, sample_user_data):
         """Test getting user by Telegram ID"""
         # User doesn't exist
@@ -158,6 +258,10 @@ class TestDatabaseManager:
         # Should get 3 word IDs
         assert len(word_ids) == 3
         assert all(isinstance(word_id, int) and word_id > 0 for word_id in word_ids)
+        assert word_ids == [
+            temp_db.get_word_by_lemma(lemma)["id"]
+            for lemma in ("haus", "gehen", "schön")
+        ]
 
         # Verify words exist
         assert temp_db.check_word_exists(user_id, "haus")
@@ -205,6 +309,62 @@ class TestDatabaseManager:
         assert len(words) == 1
         assert words[0]["lemma"] == sample_word_data["lemma"]
 
+    def test_iter_words_by_user_pages_through_every_word(
+        self, temp_db, sample_user_data
+    ):
+        """Keyset pages cover all words once, newest first, across ties"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        # One batch shares a created_at second, so pages split inside a tie
+        temp_db.add_words_to_user(
+            user_id,
+            [
+                {"lemma": f"wort{i}", "part_of_speech": "noun", "translation": "слово"}
+                for i in range(7)
+            ],
+        )
+
+        paged = list(temp_db.iter_words_by_user(user_id, page_size=3))
+        assert [word["lemma"] for word in paged] == [
+            f"wort{i}" for i in range(6, -1, -1)
+        ]
+        assert "page_created_at" not in paged[0]
+        assert paged == temp_db.get_words_by_user(user_id)
+
+    def test_iter_words_by_user_pages_past_null_created_at(
+        self, temp_db, sample_user_data
+    ):
+        """Rows without created_at come last and never restart paging"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        temp_db.add_words_to_user(
+            user_id,
+            [
+                {"lemma": f"wort{i}", "part_of_speech": "noun", "translation": "слово"}
+                for i in range(5)
+            ],
+        )
+        with temp_db.get_connection() as conn:
+            conn.execute(
+                """
+                UPDATE learning_progress SET created_at = NULL
+                WHERE word_id IN (
+                    SELECT id FROM words WHERE lemma IN ('wort0', 'wort1', 'wort2')
+                )
+                """
+            )
+            conn.commit()
+
+        paged = list(itertools.islice(temp_db.iter_words_by_user(user_id, 2), 10))
+
+        assert [word["lemma"] for word in paged] == [
+            "wort4",
+            "wort3",
+            "wort2",
+            "wort1",
+            "wort0",
+        ]
+
     def test_get_due_words(self, temp_db, sample_user_data, sample_word_data):
         """Test getting due words"""
         user = temp_db.create_user(**sample_user_data)
@@ -230,6 +390,30 @@ class TestDatabaseManager:
         assert new_words[0]["id"] == word_id
         assert new_words[0]["repetitions"] == 0
 
+    def test_randomized_new_words_sample_within_the_candidates(
+        self, temp_db, sample_user_data
+    ):
+        """Test the sampled path returns distinct candidates up to the limit"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        lemmas = [f"wort{i}" for i in range(12)]
+        temp_db.add_words_to_user(
+            user_id,
+            [
+                {"lemma": lemma, "part_of_speech": "noun", "translation": "слово"}
+                for lemma in lemmas
+            ],
+        )
+
+        sampled = temp_db.get_new_words(user_id, limit=5, randomize=True)
+        assert len(sampled) == 5
+        assert len({word["id"] for word in sampled}) == 5
+        assert {word["lemma"] for word in sampled} <= set(lemmas)
+        assert all(word["repetitions"] == 0 for word in sampled)
+
+        assert len(temp_db.get_new_words(user_id, limit=50, randomize=True)) == 12
+        assert temp_db.get_new_words(user_id, limit=0, randomize=True) == []
+
     def test_update_learning_progress(
         self, temp_db, sample_user_data, sample_word_data
     ):
@@ -362,6 +546,59 @@ class TestDatabaseManager:
         assert sample_word_data["lemma"] in existing
         assert "auto" in existing
 
+    def test_get_existing_words_from_list_matches_inflected_forms(
+        self, temp_db, sample_user_data
+    ):
+        """An inflected form counts as existing when its base form is stored"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        temp_db.add_word(
+            user_id,
+            {
+                "lemma": "bedeuten",
+                "part_of_speech": "verb",
+                "translation": "значить",
+                "example": "Was bedeutet das?",
+            },
+        )
+
+        existing = temp_db.get_existing_words_from_list(
+            user_id, ["Bedeutet", "auto", "bedeuten"]
+        )
+        assert existing == ["Bedeutet", "bedeuten"]
+        assert temp_db.word_repo.filter_existing_lemmas(
+            user_id, ["BEDEUTEN", "bedeutet"]
+        ) == ["BEDEUTEN"]
+
+    def test_existing_lemmas_match_umlaut_initial_words(
+        self, temp_db, sample_user_data
+    ):
+        """Lemmas with a non-ASCII capital are found as stored"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        temp_db.add_words_to_user(
+            user_id,
+            [
+                {"lemma": lemma, "part_of_speech": "noun", "translation": "x"}
+                for lemma in ("Übung", "Ärger", "Öl", "Haus")
+            ],
+        )
+        word_list = ["Übung", "Ärger", "Öl", "Haus", "Auto"]
+
+        assert temp_db.get_existing_words_from_list(user_id, word_list) == [
+            "Übung",
+            "Ärger",
+            "Öl",
+            "Haus",
+        ]
+        assert temp_db.word_repo.check_multiple_words_exist(user_id, word_list) == {
+            "Übung": True,
+            "Ärger": True,
+            "Öl": True,
+            "Haus": True,
+            "Auto": False,
+        }
+
     def test_check_multiple_words_exist(
         self, temp_db, sample_user_data, sample_word_data
     ):
@@ -409,6 +646,95 @@ class TestDatabaseManager:
         assert result["auto"] is True
         assert result["buch"] is False
 
+    def test_check_multiple_words_exist_bulk_path_matches_point_lookups(
+        self, temp_db, sample_user_data
+    ):
+        """Large lists go through one vocabulary fetch with the same answers"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        temp_db.add_word(
+            user_id,
+            {
+                "lemma": "bedeuten",
+                "part_of_speech": "verb",
+                "translation": "значить",
+                "example": "Was bedeutet das?",
+            },
+        )
+        temp_db.add_word(
+            user_id,
+            {"lemma": "Übung", "part_of_speech": "noun", "translation": "упражнение"},
+        )
+
+        word_list = ["Bedeutet", "BEDEUTEN", "Übung", "auto", "buch"]
+        bulk = temp_db.check_multiple_words_exist(user_id, word_list)
+        pointwise = {
+            lemma: temp_db.check_multiple_words_exist(user_id, [lemma])[lemma]
+            for lemma in word_list
+        }
+
+        assert bulk == pointwise
+        assert bulk == {
+            "Bedeutet": True,
+            "BEDEUTEN": True,
+            "Übung": True,
+            "auto": False,
+            "buch": False,
+        }
+        assert temp_db.word_repo.get_all_user_lemmas(user_id) == {"bedeuten", "Übung"}
+
+    def test_existence_check_folds_case_the_same_for_any_batch_size(
+        self, temp_db, sample_user_data
+    ):
+        """A lemma gets one answer whether it is checked alone or in bulk"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        temp_db.add_word(
+            user_id,
+            {"lemma": "Übung", "part_of_speech": "noun", "translation": "упражнение"},
+        )
+        fillers = ["a1", "b1", "c1"]
+
+        for lemma in ["Übung", "übung", "ÜBUNG", "Übungen", "übungen"]:
+            alone = temp_db.check_multiple_words_exist(user_id, [lemma])
+            bulk = temp_db.check_multiple_words_exist(user_id, [lemma, *fillers])
+            listed = temp_db.get_existing_words_from_list(user_id, [lemma, *fillers])
+            assert bulk[lemma] == alone[lemma] == (lemma in listed), lemma
+
+        assert temp_db.check_multiple_words_exist(user_id, ["Übungen", *fillers]) == {
+            "Übungen": True,
+            "a1": False,
+            "b1": False,
+            "c1": False,
+        }
+
+    def test_repository_existence_check_takes_very_large_lists(
+        self, temp_db, sample_user_data
+    ):
+        """One JSON parameter carries any number of lemmas past the bind limit"""
+        user = temp_db.create_user(**sample_user_data)
+        user_id = user["telegram_id"]
+        temp_db.add_words_to_user(
+            user_id,
+            [
+                {"lemma": "Haus", "part_of_speech": "noun", "translation": "дом"},
+                {"lemma": "gehen", "part_of_speech": "verb", "translation": "идти"},
+            ],
+        )
+
+        lemmas = [f"wort{i}" for i in range(40000)] + ["haus", "GEHEN"]
+        result = temp_db.word_repo.check_multiple_words_exist(user_id, lemmas)
+
+        assert len(result) == len(lemmas)
+        assert {lemma for lemma, exists in result.items() if exists} == {
+            "haus",
+            "GEHEN",
+        }
+        assert temp_db.word_repo.filter_existing_lemmas(user_id, lemmas) == [
+            "haus",
+            "GEHEN",
+        ]
+
     def test_german_verb_inflection_detection(self, temp_db, sample_user_data):
         """Test detection of German verb inflections (bedeutet case)"""
         user = temp_db.create_user(**sample_user_data)
@@ -455,6 +781,13 @@ class TestDatabaseManager:
         assert "gehen" in temp_db._get_potential_lemmas("gehe")
         assert "sprechen" in temp_db._get_potential_lemmas("sprechen")
 
+    def test_potential_lemmas_keep_the_word_first(self, temp_db):
+        """The word itself is checked before the guessed base form"""
+        assert temp_db._get_potential_lemmas("bedeutet") == ("bedeutet", "bedeuten")
+        # Nothing to strip: no guesses at all
+        assert temp_db._get_potential_lemmas("Haus") == ("Haus",)
+        assert temp_db._get_potential_lemmas("ist") == ("ist",)
+
     def test_get_verb_words(self, temp_db):
         """Test getting verb words specifically"""
         # Create a test user
@@ -656,6 +989,26 @@ class TestDatabaseGlobals:
         db_manager2 = get_db_manager()
         assert db_manager is db_manager2
 
+    @patch("src.database.get_database_path")
+    def test_get_db_manager_builds_one_instance_across_threads(self, mock_get_path):
+        """Concurrent first calls share a single manager"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        import src.core.database.database_manager as database_manager
+
+        mock_get_path.return_value = ":memory:"
+        database_manager._db_manager = None
+
+        with patch.object(
+            database_manager, "DatabaseManager", wraps=DatabaseManager
+        ) as constructor:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                managers = list(pool.map(lambda _: get_db_manager(), range(16)))
+
+        assert constructor.call_count == 1
+        assert all(manager is managers[0] for manager in managers)
+        database_manager._db_manager = None
+
     @patch("src.database.get_database_path")
     def test_init_db(self, mock_get_path):
         """Test database initialization function"""
@@ -665,5 +1018,158 @@ class TestDatabaseGlobals:
         init_db()
 
 
+class TestDatabaseConnection:
+    """Test per-thread connection reuse"""
+
+    def test_connection_is_reused_per_thread(self, tmp_path):
+        """Repeated and nested uses in one thread share a connection"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.core.database.connection import DatabaseConnection
+
+        db = DatabaseConnection(str(tmp_path / "test_reuse.db"))
+        with db.get_connection() as first, db.get_connection() as nested:
+            assert first is nested
+        with db.get_connection() as again:
+            assert again is first
+
+        def other_thread_connection():
+            with db.get_connection() as conn:
+                return conn
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(other_thread_connection).result() is not first
+
+        db.close()
+        with db.get_connection() as reopened:
+            assert reopened is not first
+
+    def test_every_thread_connection_is_configured(self, tmp_path):
+        """Per-connection pragmas hold on connections opened later, too"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.core.database.connection import DatabaseConnection
+
+        db = DatabaseConnection(str(tmp_path / "test_pragmas.db"))
+
+        def settings():
+            with db.get_connection() as conn:
+                return tuple(
+                    conn.execute(f"PRAGMA {name}").fetchone()[0]
+                    for name in ("journal_mode", "synchronous", "foreign_keys")
+                )
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(settings).result() == ("wal", 1, 1)
+        assert settings() == ("wal", 1, 1)
+        db.close()
+
+    def test_uncommitted_writes_are_rolled_back(self, tmp_path):
+        """Leaving the outermost block discards what was not committed"""
+        from src.core.database.connection import DatabaseConnection
+
+        db = DatabaseConnection(str(tmp_path / "test_rollback.db"))
+        with db.get_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        db.close()
+
+    def test_reader_is_read_only_and_sees_committed_writes(self, tmp_path):
+        """Reads get a query_only connection unless a write block is open"""
+        from src.core.database.connection import DatabaseConnection
+
+        db = DatabaseConnection(str(tmp_path / "test_reader.db"))
+        with db.get_connection() as writer:
+            writer.execute("CREATE TABLE t (x INTEGER)")
+            writer.execute("INSERT INTO t VALUES (1)")
+            writer.commit()
+
+        with db.get_reader() as reader:
+            assert reader is not writer
+            assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO t VALUES (2)")
+
+        with db.get_connection() as writer:
+            writer.execute("INSERT INTO t VALUES (2)")
+            with db.get_reader() as nested:
+                assert nested is writer
+                assert nested.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+        db.close()
+
+    def test_explain_plans_logs_each_full_scan_once(self, tmp_path, caplog):
+        """The opt-in plan check flags unindexed lookups, once per statement"""
+        from src.core.database.connection import DatabaseConnection
+
+        db = DatabaseConnection(str(tmp_path / "test_explain.db"), explain_plans=True)
+        with db.get_connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER, y INTEGER)")
+            conn.execute("CREATE INDEX idx_t_x ON t(x)")
+            with caplog.at_level("WARNING"):
+                for value in (1, 2):
+                    conn.execute("SELECT * FROM t WHERE y = ?", (value,))
+                conn.execute("SELECT * FROM t WHERE x = ?", (1,))
+
+        scans = [r.message for r in caplog.records if "Query plan scans" in r.message]
+        assert len(scans) == 1
+        assert "WHERE y = ?" in scans[0]
+        db.close()
+
+
+class TestRowCache:
+    """Test the TTL/LRU cache in front of hot single-row reads"""
+
+    def test_hit_returns_a_copy(self):
+        """Callers get their own copy of a cached row"""
+        cache = RowCache()
+        cache.set("haus", {"id": 1})
+
+        row = cache.get("haus")
+        row["extra"] = True
+
+        assert cache.get("haus") == {"id": 1}
+        assert cache.get("auto") is None
+
+    def test_expired_and_evicted_entries_are_dropped(self):
+        """Least recently used and expired rows fall out"""
+        cache = RowCache(maxsize=2, ttl=60)
+        cache.set("a", {"id": 1})
+        cache.set("b", {"id": 2})
+        cache.get("a")
+        cache.set("c", {"id": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"id": 1}
+
+        with patch("src.core.database.cache.time.monotonic", return_value=1e12):
+            assert cache.get("c") is None
+
+    def test_review_invalidates_cached_progress(self, tmp_path):
+        """A review drops the cached progress row for that card"""
+        db = DatabaseManager(str(tmp_path / "test_cache.db"))
+        db.init_database()
+        db.create_user(telegram_id=1, first_name="Test")
+        db.add_words_to_user(
+            1,
+            [
+                {
+                    "lemma": "Haus",
+                    "part_of_speech": "noun",
+                    "translation": "дом",
+                    "example": "Das Haus.",
+                }
+            ],
+        )
+        word = db.get_word_by_lemma("Haus")
+
+        assert db.get_learning_progress(1, word["id"])["repetitions"] == 0
+        db.update_learning_progress(1, word["id"], 3)
+        assert db.get_learning_progress(1, word["id"])["repetitions"] == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -116,9 +116,9 @@ class TestFalsePositiveBug:
 
         # Mock the database responses
         mock_conn = MagicMock()
-        mock_db_connection.return_value.get_connection.return_value.__enter__.return_value = mock_conn
+        mock_db_connection.return_value.get_reader.return_value.__enter__.return_value = mock_conn
 
-        # Main stats query
+        # Combined stats query: word counts, review split, today's activity
         mock_cursor_main = MagicMock()
         mock_cursor_main.fetchone.return_value = {
             "total_words": 300,
@@ -126,28 +126,18 @@ class TestFalsePositiveBug:
             "due_words": 30,
             "learned_words": 50,
             "difficult_words": 10,
-        }
-
-        # Correct/incorrect review counts query
-        mock_cursor_accuracy = MagicMock()
-        mock_cursor_accuracy.fetchone.return_value = {
             "total_reviews": 100,
             "correct_reviews": 65,
             "incorrect_reviews": 35,
+            "reviews_today": 5,
         }
 
-        # Today's activity query
-        mock_cursor_today = MagicMock()
-        mock_cursor_today.fetchone.return_value = {"reviews_today": 5}
-
         # Study streak query
         mock_cursor_streak = MagicMock()
         mock_cursor_streak.fetchall.return_value = []
 
         mock_conn.execute.side_effect = [
             mock_cursor_main,
-            mock_cursor_accuracy,
-            mock_cursor_today,
             mock_cursor_streak,
         ]
 
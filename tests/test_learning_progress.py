@@ -190,6 +190,102 @@ class TestLearningProgress:
             "Review should have correct response time"
         )
 
+    def test_review_uses_one_timestamp(self, db_manager, test_user, test_words):
+        """last_reviewed, updated_at and the history row share one timestamp"""
+        user_id = test_user["telegram_id"]
+        word_id = test_words[0]["id"]
+
+        assert db_manager.progress_repo.update_learning_progress(user_id, word_id, 3)
+
+        progress = db_manager.progress_repo.get_learning_progress(user_id, word_id)
+        review = db_manager.progress_repo.get_review_history(user_id, word_id)[0]
+        assert progress["last_reviewed"] == progress["updated_at"]
+        assert review["reviewed_at"] == progress["last_reviewed"]
+
+    def test_bulk_reviews_match_single_reviews(self, db_manager, test_user, test_words):
+        """A batch ends in the same state as the same reviews one by one"""
+        user_id = test_user["telegram_id"]
+        house_id, go_id = test_words[0]["id"], test_words[1]["id"]
+
+        other = db_manager.user_repo.create_user(user_id + 1, "Other")
+        db_manager.word_repo.add_words_to_user(
+            other["telegram_id"],
+            [
+                {"lemma": w["lemma"], "translation": w["translation"]}
+                for w in test_words
+            ],
+        )
+
+        reviews = [(house_id, 4, 900), (go_id, 1, 1500), (house_id, 3, 700)]
+        assert db_manager.bulk_add_reviews(user_id, reviews)
+        for word_id, rating, response_time_ms in reviews:
+            db_manager.update_learning_progress(
+                other["telegram_id"], word_id, rating, response_time_ms
+            )
+
+        for word_id in (house_id, go_id):
+            bulk = db_manager.get_learning_progress(user_id, word_id)
+            single = db_manager.get_learning_progress(other["telegram_id"], word_id)
+            for field in ("repetitions", "easiness_factor", "interval_days"):
+                assert bulk[field] == single[field]
+
+        history = db_manager.get_review_history(user_id)
+        assert sorted(r["rating"] for r in history) == [1, 3, 4]
+
+    def test_bulk_reviews_create_missing_progress(self, db_manager, test_user):
+        """A reviewed word without a progress row gets one, as in the single path"""
+        user_id = test_user["telegram_id"]
+        word = db_manager.word_repo.create_word(
+            {
+                "lemma": "Baum",
+                "part_of_speech": "noun",
+                "translation": "дерево",
+                "example": "Der Baum.",
+            }
+        )
+
+        assert db_manager.bulk_add_reviews(user_id, [(word["id"], 3, 0)])
+
+        progress = db_manager.get_learning_progress(user_id, word["id"])
+        assert progress["repetitions"] == 1
+        assert db_manager.bulk_add_reviews(user_id, [])
+
+    def test_iter_review_history_matches_list(self, db_manager, test_user, test_words):
+        """The streaming variant yields the same rows as get_review_history"""
+        user_id = test_user["telegram_id"]
+        word_id = test_words[0]["id"]
+        for rating in (3, 4, 2):
+            db_manager.update_learning_progress(user_id, word_id, rating)
+
+        history = db_manager.get_review_history(user_id, word_id)
+        assert list(db_manager.iter_review_history(user_id, word_id)) == history
+
+        rows = db_manager.iter_review_history(user_id)
+        assert next(rows) == history[0]
+        rows.close()
+
+    def test_first_review_upserts_progress(self, db_manager, test_user):
+        """Reviewing a word with no progress row creates it, then counts up"""
+        user_id = test_user["telegram_id"]
+        word = db_manager.word_repo.create_word(
+            {
+                "lemma": "Wald",
+                "part_of_speech": "noun",
+                "translation": "лес",
+                "example": "Der Wald.",
+            }
+        )
+
+        repo = db_manager.progress_repo
+        assert repo.update_learning_progress(user_id, word["id"], 3)
+        assert repo.get_learning_progress(user_id, word["id"])["repetitions"] == 1
+
+        assert repo.update_learning_progress(user_id, word["id"], 3, 5, 2.4)
+        progress = repo.get_learning_progress(user_id, word["id"])
+        assert progress["repetitions"] == 2
+        assert progress["interval_days"] == 5
+        assert len(repo.get_review_history(user_id, word["id"])) == 2
+
     def test_multiple_reviews_tracking(self, db_manager, test_user, test_words):
         """Test that multiple reviews are tracked correctly"""
         user_id = test_user["telegram_id"]
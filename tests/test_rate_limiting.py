@@ -4,10 +4,12 @@ Tests for rate limiting functionality
 
 import asyncio
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from telegram.error import RetryAfter
 
+from src.core.locks.telegram_rate_limiter import TelegramRateLimiter, TokenBucket
 from src.core.locks.user_lock_manager import UserLockManager
 
 
@@ -105,6 +107,32 @@ class TestUserLockManager:
         assert not lock_manager.is_locked(user_id)  # Should cleanup expired lock
         assert lock_manager.get_lock_info(user_id) is None
 
+    @pytest.mark.asyncio
+    async def test_expired_lock_can_be_reacquired(self, lock_manager):
+        """Acquiring over an expired lock replaces it"""
+        user_id = 123
+        assert lock_manager.acquire_lock(user_id, "add_words") is True
+        lock_manager._locks[user_id].locked_at = datetime.now() - timedelta(minutes=2)
+
+        assert lock_manager.acquire_lock(user_id, "study_session") is True
+        assert lock_manager.get_lock_info(user_id).operation == "study_session"
+
+    @pytest.mark.asyncio
+    async def test_lookup_checks_only_the_requested_user(self, lock_manager):
+        """A per-user lookup leaves other users' locks to the sweep"""
+        lock_manager.acquire_lock(123, "add_words")
+        lock_manager.acquire_lock(456, "add_words")
+        lock_manager._locks[456].locked_at = datetime.now() - timedelta(minutes=2)
+
+        assert lock_manager.is_locked(123)
+        assert 456 in lock_manager._locks
+        locks = lock_manager._locks
+
+        lock_manager._cleanup_expired_locks()
+        assert 456 not in lock_manager._locks
+        # Swept in place rather than rebuilt
+        assert lock_manager._locks is locks
+
     @pytest.mark.asyncio
     async def test_force_release_lock(self, lock_manager):
         """Test force release functionality"""
@@ -154,10 +182,19 @@ class TestUserLockManager:
         assert 456 in locked_users
         assert locked_users[123].operation == "add_words"
         assert locked_users[456].operation == "study_session"
+        with pytest.raises(TypeError):
+            locked_users[789] = locked_users[123]
+
+        # The view stays current through an expiry sweep
+        lock_manager._locks[456].locked_at = datetime.now() - timedelta(minutes=10)
+        lock_manager._cleanup_expired_locks()
+        assert 456 not in locked_users
+        lock_manager.acquire_lock(789, "add_words")
+        assert 789 in locked_users
+        lock_manager.release_lock(789)
 
         # Clean up
         lock_manager.release_lock(123)
-        lock_manager.release_lock(456)
 
     @pytest.mark.asyncio
     async def test_periodic_cleanup_task(self):
@@ -216,6 +253,82 @@ class TestUserLockManager:
 
         lock_manager.release_lock(user_id)
 
+    @pytest.mark.asyncio
+    async def test_reacquired_lock_gets_a_new_id(self, lock_manager):
+        """Back-to-back locks for one user never share an id"""
+        lock_manager.acquire_lock(123, "add_words")
+        first_id = lock_manager.get_lock_info(123).lock_id
+        lock_manager.release_lock(123)
+
+        lock_manager.acquire_lock(123, "add_words")
+
+        assert lock_manager.get_lock_info(123).lock_id != first_id
+        lock_manager.release_lock(123)
+
+
+class TestTelegramRateLimiter:
+    """Tests for outgoing Bot API throttling"""
+
+    @pytest.mark.asyncio
+    async def test_bucket_spreads_a_burst_over_the_period(self):
+        """Requests beyond the bucket size wait for tokens to refill"""
+        bucket = TokenBucket(rate=2, period=0.2)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+
+        # Two go at once, the other two wait one refill interval each
+        assert loop.time() - started >= 0.19
+
+    @pytest.mark.asyncio
+    async def test_group_chats_get_their_own_bucket(self):
+        """Group chats are throttled per chat, private chats are not"""
+        limiter = TelegramRateLimiter(group_rate=1, group_period=60.0)
+        callback = AsyncMock(return_value=True)
+
+        for _ in range(3):
+            await limiter.process_request(
+                callback, (), {}, "sendMessage", {"chat_id": 123}, None
+            )
+        await limiter.process_request(
+            callback, (), {}, "sendMessage", {"chat_id": -100}, None
+        )
+
+        assert callback.await_count == 4
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                limiter.process_request(
+                    callback, (), {}, "sendMessage", {"chat_id": -100}, None
+                ),
+                timeout=0.05,
+            )
+
+    @pytest.mark.asyncio
+    async def test_retry_after_waits_and_retries(self):
+        """A flood-limit reply is retried once after the requested pause"""
+        limiter = TelegramRateLimiter(max_retries=1)
+        callback = AsyncMock(side_effect=[RetryAfter(timedelta(0)), {"ok": True}])
+
+        result = await limiter.process_request(
+            callback, (), {}, "sendMessage", {"chat_id": 123}, None
+        )
+
+        assert result == {"ok": True}
+        assert callback.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_raised_once_retries_run_out(self):
+        """The limiter does not retry forever"""
+        limiter = TelegramRateLimiter(max_retries=0)
+        callback = AsyncMock(side_effect=RetryAfter(timedelta(0)))
+
+        with pytest.raises(RetryAfter):
+            await limiter.process_request(
+                callback, (), {}, "sendMessage", {"chat_id": 123}, None
+            )
+
 
 class TestRateLimitingIntegration:
     """Integration tests for rate limiting in bot_handler"""
@@ -4,6 +4,7 @@ Test cases for the ReminderScheduler functionality
 
 import asyncio
 import contextlib
+import sys
 from datetime import datetime, time, timedelta
 from unittest.mock import AsyncMock, patch
 from zoneinfo import ZoneInfo
@@ -194,6 +195,109 @@ class TestReminderScheduler:
                 # Should have slept for error recovery
                 mock_sleep.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_schedule_loop_retry_sleep_does_not_hold_the_error(self, scheduler):
+        """The one-minute retry wait runs after the exception is released"""
+        errors_during_sleep = []
+
+        async def record_sleep(seconds):
+            errors_during_sleep.append(sys.exc_info()[1])
+            scheduler.is_running = False
+
+        with (
+            patch.object(
+                scheduler, "_get_next_reminder_time", side_effect=Exception("boom")
+            ),
+            patch("asyncio.sleep", side_effect=record_sleep),
+        ):
+            scheduler.is_running = True
+
+            await scheduler._schedule_loop()
+
+        assert errors_during_sleep == [None]
+
+    @pytest.mark.asyncio
+    async def test_schedule_loop_sleeps_real_seconds_across_dst(self, mock_callback):
+        """Berlin's spring-forward night is 21 real hours from 20:00 to 18:00"""
+        berlin = ReminderScheduler(
+            mock_callback, reminder_time="18:00", timezone="Europe/Berlin"
+        )
+        sleeps = []
+
+        async def record_sleep(seconds):
+            sleeps.append(seconds)
+            berlin.is_running = False
+
+        with (
+            patch("src.core.scheduler.reminder_scheduler.datetime") as mock_datetime,
+            patch("asyncio.sleep", side_effect=record_sleep),
+        ):
+            mock_datetime.now.return_value = datetime(
+                2024, 3, 30, 20, 0, tzinfo=ZoneInfo("Europe/Berlin")
+            )
+            mock_datetime.combine = datetime.combine
+            berlin.is_running = True
+
+            await berlin._schedule_loop()
+
+        assert sleeps == [21 * 3600]
+        mock_callback.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_schedule_loop_advances_a_day_after_firing(
+        self, scheduler, mock_callback
+    ):
+        """Each fire time is sent once, then the next one is a day later"""
+        now = datetime(2024, 1, 15, 18, 0, tzinfo=ZoneInfo("UTC"))
+        sleeps = []
+
+        async def record_sleep(seconds):
+            sleeps.append(seconds)
+            scheduler.is_running = False
+
+        with (
+            patch.object(scheduler, "_get_next_reminder_time", return_value=now),
+            patch("src.core.scheduler.reminder_scheduler.datetime") as mock_datetime,
+            patch("asyncio.sleep", side_effect=record_sleep),
+        ):
+            mock_datetime.now.return_value = now
+            scheduler.is_running = True
+
+            await scheduler._schedule_loop()
+
+        assert mock_callback.await_count == 1
+        assert sleeps == [24 * 3600]
+
+    @pytest.mark.asyncio
+    async def test_schedule_loop_skips_days_missed_while_suspended(
+        self, scheduler, mock_callback
+    ):
+        """Waking days late sends one reminder, then waits for the next one"""
+        utc = ZoneInfo("UTC")
+        now = datetime(2024, 1, 18, 12, 0, tzinfo=utc)
+        stale = datetime(2024, 1, 15, 18, 0, tzinfo=utc)
+        upcoming = datetime(2024, 1, 18, 18, 0, tzinfo=utc)
+        sleeps = []
+
+        async def record_sleep(seconds):
+            sleeps.append(seconds)
+            scheduler.is_running = False
+
+        with (
+            patch.object(
+                scheduler, "_get_next_reminder_time", side_effect=[stale, upcoming]
+            ),
+            patch("src.core.scheduler.reminder_scheduler.datetime") as mock_datetime,
+            patch("asyncio.sleep", side_effect=record_sleep),
+        ):
+            mock_datetime.now.return_value = now
+            scheduler.is_running = True
+
+            await scheduler._schedule_loop()
+
+        assert mock_callback.await_count == 1
+        assert sleeps == [6 * 3600]
+
     @pytest.mark.asyncio
     async def test_schedule_loop_cancellation(self, scheduler):
         """Test proper cancellation handling in schedule loop"""
@@ -127,6 +127,13 @@ class TestLemmaSetQueries:
 
         assert existence == {"WORT0": True, "nicht_da": False}
 
+    def test_repeated_lemmas_are_each_answered(self, stocked):
+        existence = stocked.check_multiple_words_exist(
+            TELEGRAM_ID, ["wort0", "Wort0", "wort0", "nicht_da"]
+        )
+
+        assert existence == {"wort0": True, "Wort0": True, "nicht_da": False}
+
     def test_a_quote_in_a_lemma_is_not_sql(self, stocked):
         existence = stocked.check_multiple_words_exist(
             TELEGRAM_ID, ["'; DROP TABLE words;--"]
@@ -150,9 +150,10 @@ class TestStatsFieldMapping:
 
         # Mock database responses to simulate the production scenario
         mock_conn = MagicMock()
-        mock_db_connection.return_value.get_connection.return_value.__enter__.return_value = mock_conn
+        mock_db_connection.return_value.get_reader.return_value.__enter__.return_value = mock_conn
 
-        # Mock the main stats query response (total_words, new_words, etc.)
+        # Mock the combined stats query response: word counts, the 30-day
+        # correct/incorrect split and today's activity in one row
         mock_cursor_main = MagicMock()
         mock_cursor_main.fetchone.return_value = {
             "total_words": 716,
@@ -161,29 +162,19 @@ class TestStatsFieldMapping:
             "learned_words": 1,
             "difficult_words": 0,
             "words_today": 5,
-        }
-
-        # Mock the correct/incorrect review counts query response
-        mock_cursor_accuracy = MagicMock()
-        mock_cursor_accuracy.fetchone.return_value = {
             "total_reviews": 99,
             "correct_reviews": 34,
             "incorrect_reviews": 65,
+            "reviews_today": 0,
         }
 
-        # Mock the today's activity query response
-        mock_cursor_today = MagicMock()
-        mock_cursor_today.fetchone.return_value = {"reviews_today": 0}
-
         # Mock the streak query response (no reviews yesterday/today -> streak 0)
         mock_cursor_streak = MagicMock()
         mock_cursor_streak.fetchall.return_value = []
 
         # Set up the execute call returns in order
         mock_conn.execute.side_effect = [
-            mock_cursor_main,  # Main stats query
-            mock_cursor_accuracy,  # Correct/incorrect query
-            mock_cursor_today,  # Today's activity query
+            mock_cursor_main,  # Combined stats query
             mock_cursor_streak,  # Study streak query
         ]
 
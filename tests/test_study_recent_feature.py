@@ -2,6 +2,7 @@
 Tests for the study_recent feature (study last N added words)
 """
 
+import threading
 from unittest.mock import AsyncMock, Mock
 
 import pytest
@@ -93,6 +94,20 @@ class TestStudyRecentFeature:
         )
         command_handlers._start_study_session.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_database_calls_run_off_the_event_loop(
+        self, command_handlers, mock_update
+    ):
+        loop_thread = threading.get_ident()
+        call_threads = []
+        command_handlers.db_manager.get_recent_words.side_effect = lambda *a, **kw: (
+            call_threads.append(threading.get_ident()) or []
+        )
+
+        await command_handlers.study_recent_command(mock_update, self._mock_context())
+
+        assert call_threads and loop_thread not in call_threads
+
     @pytest.mark.asyncio
     async def test_study_recent_custom_limit(self, command_handlers, mock_update):
         await command_handlers.study_recent_command(
@@ -8,6 +8,7 @@ import importlib.util
 import json
 import os
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock
 
@@ -543,6 +544,18 @@ class TestCommands:
         )
         handlers._start_study_session.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_rubric_query_runs_off_the_event_loop(self, handlers, update):
+        loop_thread = threading.get_ident()
+        call_threads = []
+        handlers.db_manager.get_dativ_verbs.side_effect = lambda *a, **kw: (
+            call_threads.append(threading.get_ident()) or []
+        )
+
+        await handlers.study_dativ_verbs_command(update, self._context())
+
+        assert call_threads and loop_thread not in call_threads
+
     @pytest.mark.parametrize(
         "command,getter,expected",
         [